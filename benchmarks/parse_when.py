@@ -0,0 +1,190 @@
+"""Benchmark parse_when_to_datetime over a corpus of typical reminder times
+
+The strptime-probing parser it replaced is timed alongside as a baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.parse_when
+"""
+
+import calendar
+import re
+import timeit
+from datetime import datetime, timedelta
+
+from cogs.reminders import _add_months, _parse_expression, parse_when_to_datetime
+
+CORPUS = [
+    "2h",
+    "in 10 minutes",
+    "30m",
+    "2h30m",
+    "4h15",
+    "in 2 weeks",
+    "3 days",
+    "30 minutes",
+    "10 seconds",
+    "in a month",
+    "in 1 year",
+    "an hour",
+    "tomorrow",
+    "next week",
+    "monday",
+    "friday 14:30",
+    "next sunday 09:15",
+    "2030-01-05 14:30",
+    "2030-01-05",
+    "12/3",
+    "12/25 18:00",
+    "garbage",
+]
+NUMBER = 2000
+
+
+def legacy_parse_when_to_datetime(when: str) -> datetime:
+    """The strptime-probing parser that the compiled grammar replaced
+
+    Kept verbatim (apart from the name) as the benchmark baseline.
+    """
+    s = when.strip().lower()
+    s = re.sub(r",", "", s)
+    now = datetime.now()
+
+    # Try ISO and common explicit formats
+    explicit_formats = [
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d",
+        "%m/%d/%Y %H:%M",
+        "%m/%d/%Y",
+        "%m/%d %H:%M",
+        "%m/%d",
+    ]
+    for fmt in explicit_formats:
+        try:
+            dt = datetime.strptime(s, fmt)
+            # If format lacked year, fill with current year
+            if fmt in ("%m/%d", "%m/%d %H:%M") and dt.year == 1900:
+                dt = dt.replace(year=now.year)
+            # If no time provided, default to 09:00
+            if fmt in ("%Y-%m-%d", "%m/%d", "%m/%d/%Y"):
+                dt = dt.replace(hour=9, minute=0)
+            # If date-only and already passed, bump year
+            if dt < now and fmt in ("%m/%d", "%m/%d/%Y", "%Y-%m-%d"):
+                try:
+                    dt = dt.replace(year=dt.year + 1)
+                except Exception:
+                    pass
+            if dt < now:
+                # For explicit datetimes, only accept future
+                raise ValueError("Please specify a future date and time.")
+            return dt
+        except ValueError:
+            continue
+
+    # Natural keywords
+    if s in ("now", "today"):
+        return now
+    if s == "tomorrow":
+        return (now + timedelta(days=1)).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        )
+    if s == "next week":
+        return (now + timedelta(weeks=1)).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        )
+
+    # Relative durations like 'in 2 weeks', '3 days', '30 minutes', 'in a month', '10 seconds'
+    m = re.match(
+        r"^(?:in\s+)?(?:(a|an)|([0-9]+))\s*(years?|yrs?|months?|weeks?|days?|hours?|hrs?|minutes?|mins?|m|seconds?|secs?|s)$",
+        s,
+    )
+    if m:
+        num = 1 if m.group(1) else int(m.group(2))
+        unit = m.group(3)
+        if unit.startswith("year") or unit.startswith("yr"):
+            try:
+                return now.replace(year=now.year + num)
+            except Exception:
+                # Feb 29 handling
+                return now.replace(year=now.year + num, day=now.day - 1)
+        if unit.startswith("month"):
+            return _add_months(now, num)
+        if unit.startswith("week"):
+            return now + timedelta(weeks=num)
+        if unit.startswith("day"):
+            return now + timedelta(days=num)
+        if unit.startswith("hour"):
+            return now + timedelta(hours=num)
+        if unit.startswith("min") or unit == "m":
+            return now + timedelta(minutes=num)
+        if unit.startswith("sec") or unit == "s":
+            return now + timedelta(seconds=num)
+
+    # Compact hour/min like '2h30m', '4h15', '2h', '30m'
+    m = re.match(r"^(?:in\s+)?(?:(\d+)h(?:ours?)?)?(?:(\d+)m)?$", s)
+    if m and (m.group(1) or m.group(2)):
+        hours = int(m.group(1)) if m.group(1) else 0
+        mins = int(m.group(2)) if m.group(2) else 0
+        return now + timedelta(hours=hours, minutes=mins)
+
+    # Weekday names optionally with time 'monday' or 'monday 14:30'
+    days = [d.lower() for d in calendar.day_name]
+    wd_match = re.match(
+        r"^(?:next\s+)?(" + "|".join(days) + r")(?:\s+(\d{1,2}:\d{2}))?$", s
+    )
+    if wd_match:
+        name = wd_match.group(1)
+        timepart = wd_match.group(2)
+        target_wd = days.index(name)
+        days_ahead = (target_wd - now.weekday() + 7) % 7
+        if days_ahead == 0:
+            days_ahead = 7
+        target = now + timedelta(days=days_ahead)
+        if timepart:
+            hh, mm = map(int, timepart.split(":"))
+            target = target.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        else:
+            target = target.replace(hour=9, minute=0, second=0, microsecond=0)
+        return target
+
+    raise ValueError(
+        "Could not understand time. Examples: '2026-01-05 14:30', '12/3', 'in 2 weeks', '2h30m', 'monday 14:00'"
+    )
+
+
+def parse_all(parse=parse_when_to_datetime):
+    for when in CORPUS:
+        try:
+            parse(when)
+        except ValueError:
+            pass
+
+
+def parse_all_legacy():
+    parse_all(legacy_parse_when_to_datetime)
+
+
+def parse_all_uncached():
+    _parse_expression.cache_clear()
+    parse_all()
+
+
+def main():
+    calls = NUMBER * len(CORPUS)
+    runs = (
+        ("baseline", parse_all_legacy),
+        ("uncached", parse_all_uncached),
+        ("cached", parse_all),
+    )
+    baseline = None
+    for name, func in runs:
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        baseline = baseline or seconds
+        print(
+            f"{name:>8}: {seconds / calls * 1e6:.2f} µs/call"
+            f" ({baseline / seconds:.1f}x faster than baseline)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,58 @@
+import asyncio
+import hashlib
+import importlib.util
+import json
 import logging
+import math
 import os
-import subprocess
+import socket
+import sys
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import CodeType, ModuleType
 
+import aiohttp
 import discord
+from aiohttp import web
+from discord import errors
 from discord.ext import commands
 
+from cluster import Cluster
+from loop_watchdog import Watchdog
+from metrics import Metrics
+from sqlite_store import DATA_DIR
+
 TOKEN = os.environ["BROBOT_TOKEN"]
 LOGLEVEL = os.environ.get("BROBOT_LOGLEVEL", "INFO").upper()
+# Prometheus metrics are served on this address; a port of 0 turns it off
+METRICS_HOST = os.environ.get("BROBOT_METRICS_HOST", "127.0.0.1")
+# Each worker of a cluster serves on METRICS_PORT plus its worker id
+METRICS_PORT = int(os.environ.get("BROBOT_METRICS_PORT", "9108"))
+# Event loop stalls longer than this many seconds are logged with a stack
+STALL_THRESHOLD = float(os.environ.get("BROBOT_STALL_THRESHOLD", "0.5"))
+# Cogs, by module name, that aren't loaded until one of their commands is
+# used. Their command names are remembered in COG_MANIFEST from the last
+# time they were loaded.
+DEFERRED_COGS = {
+    name.strip()
+    for name in os.environ.get("BROBOT_DEFERRED_COGS", "").split(",")
+    if name.strip()
+}
+COG_MANIFEST = DATA_DIR / "cog_manifest.json"
+# Hash and id of every command as last synced with Discord
+COMMAND_STATE = DATA_DIR / "command_state.json"
+# Command changes are synced once none have arrived for this many seconds
+SYNC_DEBOUNCE = 2
+# Reload cogs whose files change, checking every WATCH_INTERVAL seconds
+WATCH_COGS = os.environ.get("BROBOT_WATCH_COGS", "").lower() in ("1", "true", "yes")
+WATCH_INTERVAL = 1
+# How long a graceful restart waits for the replacement process to connect,
+# and then for commands in progress to finish
+RESTART_READY_TIMEOUT = 120
+RESTART_DRAIN_TIMEOUT = 30
+RESTART_LISTEN_TIMEOUT = 10
 
 logging.basicConfig(
     level=LOGLEVEL,
@@ -18,29 +62,642 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
-class Brobot(discord.Bot):
+def memory_usage() -> int | None:
+    """Return the process's resident memory in bytes, or None if unknown"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Elsewhere only the peak is available, which can't show what a
+        # single load added
+        return None
+
+
+def memory_since(before: int | None) -> int | None:
+    """Return the change in resident memory since an earlier memory_usage()"""
+    after = memory_usage()
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+def format_memory(delta: int | None) -> str:
+    return "" if delta is None else f", {delta / 2**20:+.1f} MiB"
+
+
+def import_extension(spec) -> tuple[ModuleType | Exception, float, int | None]:
+    """Execute an extension's module
+
+    Returns the module or its error, the time taken and the change in resident
+    memory. Imports running in parallel share the process, so the memory
+    change includes whatever the others allocated meanwhile.
+    """
+    start = time.perf_counter()
+    memory = memory_usage()
+    lib = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = lib
+    try:
+        spec.loader.exec_module(lib)
+    except Exception as e:
+        del sys.modules[spec.name]
+        lib = e
+    return lib, time.perf_counter() - start, memory_since(memory)
+
+
+class Brobot(discord.AutoShardedBot):
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        # Run by cluster.py, this process only connects its share of the
+        # shards; otherwise it runs every shard Discord recommends
+        cluster = Cluster.from_env(METRICS_HOST, METRICS_PORT)
+        super().__init__(
+            *args,
+            shard_ids=cluster.shard_ids,
+            shard_count=cluster.shard_count,
+            **kwargs,
+        )
+        self.cluster = cluster
         self.start_time = datetime.now()
+        # Shared by every cog for upstream API calls; created in start() so
+        # it binds to the running event loop
+        self.http_session: aiohttp.ClientSession | None = None
+        self.metrics = Metrics()
+        self.watchdog = Watchdog(
+            STALL_THRESHOLD,
+            on_lag=self.metrics.observe_loop_lag,
+            commands=self.command_callbacks,
+        )
+        self.watchdog.start()
+        self.metrics.app.router.add_get("/health", self._handle_health)
+        self.cluster.local_health = self.health
+        # extension -> (import seconds, import memory delta, setup seconds,
+        # setup memory delta) of its last load. Memory deltas are in bytes,
+        # or None where resident memory can't be read.
+        self.extension_profiles: dict[
+            str, tuple[float, int | None, float, int | None]
+        ] = {}
+        # extension -> import_extension result, imported ahead of
+        # load_extension
+        self._preloaded: dict[str, tuple[ModuleType | Exception, float, int | None]] = (
+            {}
+        )
+        # command name -> the deferred extension that defines it
+        self.deferred_commands: dict[str, str] = {}
+        self._deferred_loads: dict[str, asyncio.Task] = {}
+        self._sync_handle: asyncio.TimerHandle | None = None
+        self._sync_task: asyncio.Task | None = None
+        self._sync_lock = asyncio.Lock()
+        self._commands_synced = False
+        # extension -> mtime of its file when it was last loaded
+        self.extension_mtimes: dict[str, int] = {}
+        self._reload_lock = asyncio.Lock()
+        self._watch_task: asyncio.Task | None = None
+        # Interaction ids of commands that haven't finished yet
+        self.in_flight: set[int] = set()
+        # Interactions are only handled while serving. A process started by
+        # a graceful restart starts serving when the old one hands over, and
+        # stops running its own background work until that one has flushed.
+        self.serving = asyncio.Event()
+        self.handoff_complete = asyncio.Event()
+        self.draining = False
+        self._handoff_task: asyncio.Task | None = None
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
         self.load_cogs_in_directory("cogs")
 
+    async def start(self, *args, **kwargs):
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=10,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        self.http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=15, connect=5),
+        )
+        self.cluster.session = self.http_session
+        self.watchdog.attach(asyncio.get_running_loop())
+        if WATCH_COGS:
+            self.watch_cogs(True)
+        handoff_fd = os.environ.pop("BROBOT_HANDOFF_FD", None)
+        if handoff_fd is None:
+            await self.start_servers()
+            self.serving.set()
+            self.handoff_complete.set()
+        else:
+            # The old process holds the ports until it has flushed
+            self._handoff_task = asyncio.create_task(self._take_over(int(handoff_fd)))
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        await super().close()
+        self.watchdog.stop()
+        await self.stop_servers()
+        if self.http_session is not None:
+            await self.http_session.close()
+
+    async def start_servers(self):
+        """Start serving metrics and health, and handlers to other workers"""
+        await self.metrics.start(METRICS_HOST, self.cluster.port)
+        await self.cluster.start()
+
+    async def stop_servers(self):
+        await self.metrics.stop()
+        await self.cluster.stop()
+
+    def health(self) -> dict:
+        """Return this worker's state for the cluster health view"""
+        shards = {
+            str(shard_id): {
+                # NaN or inf until the shard's first heartbeat
+                "latency": shard.latency if math.isfinite(shard.latency) else None,
+                "closed": shard.is_closed(),
+            }
+            for shard_id, shard in self.shards.items()
+        }
+        ready = self.is_ready()
+        return {
+            "worker": self.cluster.worker_id,
+            "pid": os.getpid(),
+            "healthy": ready
+            and self.serving.is_set()
+            and not any(shard["closed"] for shard in shards.values()),
+            "ready": ready,
+            "serving": self.serving.is_set(),
+            "draining": self.draining,
+            "shards": shards,
+            "guilds": len(self.guilds),
+            "in_flight": len(self.in_flight),
+            "loop_lag": self.metrics.last_loop_lag,
+            "memory": memory_usage(),
+            "uptime": (datetime.now() - self.start_time).total_seconds(),
+        }
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response(self.health())
+
+    def command_callbacks(self) -> dict[CodeType, str]:
+        """Return the code object -> name of every command callback"""
+        # Every registered command, whether or not it has been synced yet
+        commands = []
+        for command in self.pending_application_commands:
+            if isinstance(command, discord.SlashCommandGroup):
+                commands.extend(command.walk_commands())
+            commands.append(command)
+        return {
+            command.callback.__code__: command.qualified_name
+            for command in commands
+            if getattr(command, "callback", None)
+        }
+
+    def add_application_command(self, command):
+        super().add_application_command(command)
+        self.watchdog.refresh_commands()
+
+    def remove_application_command(self, command):
+        removed = super().remove_application_command(command)
+        self.watchdog.refresh_commands()
+        return removed
+
+    @property
+    def deferred_extensions(self) -> set[str]:
+        return set(self.deferred_commands.values())
+
+    def _load_from_module_spec(self, spec, key: str):
+        # Mirrors discord.Bot's version, but takes modules already imported
+        # in parallel by load_cogs_in_directory and profiles each load
+        preloaded = self._preloaded.pop(key, None)
+        lib, import_time, import_memory = preloaded or import_extension(spec)
+        if isinstance(lib, Exception):
+            raise errors.ExtensionFailed(key, lib) from lib
+        sys.modules[key] = lib
+
+        setup = getattr(lib, "setup", None)
+        if setup is None:
+            del sys.modules[key]
+            raise errors.NoEntryPointError(key)
+
+        start = time.perf_counter()
+        memory = memory_usage()
+        try:
+            setup(self)
+        except Exception as e:
+            del sys.modules[key]
+            self._remove_module_references(lib.__name__)
+            self._call_module_finalizers(lib, key)
+            raise errors.ExtensionFailed(key, e) from e
+        self._CogMixin__extensions[key] = lib
+
+        self.extension_profiles[key] = (
+            import_time,
+            import_memory,
+            time.perf_counter() - start,
+            memory_since(memory),
+        )
+        self.deferred_commands = {
+            name: ext for name, ext in self.deferred_commands.items() if ext != key
+        }
+        self._update_manifest(key, lib)
+
+    def _read_manifest(self) -> dict:
+        try:
+            return json.loads(COG_MANIFEST.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _update_manifest(self, key: str, lib: ModuleType):
+        self.extension_mtimes[key] = os.stat(lib.__file__).st_mtime_ns
+        manifest = self._read_manifest()
+        manifest[key] = {
+            "mtime_ns": self.extension_mtimes[key],
+            "commands": [
+                command.name
+                for command in self.pending_application_commands
+                if command.cog is not None and command.cog.__module__ == key
+            ],
+        }
+        COG_MANIFEST.write_text(json.dumps(manifest, indent=2))
+
     def load_cogs_in_directory(self, directory: str):
         filepath = os.path.abspath(__file__)
         dirname = os.path.dirname(filepath) + f"/{directory}"
+        self.cogs_directory = directory
 
         if not os.path.isdir(dirname):
             log.warning(f"Cogs directory not found: {dirname}")
             return
 
-        for filename in os.listdir(dirname):
-            if filename.endswith(".py"):
-                cog = f"{directory}." + filename.split(".")[0]
-                try:
-                    self.load_extension(cog)
-                except Exception as e:
-                    log.error(f"{cog} failed to load: {e}")
+        start = time.perf_counter()
+        memory = memory_usage()
+        specs = {}
+        manifest = self._read_manifest()
+        for filename in sorted(os.listdir(dirname)):
+            if not filename.endswith(".py"):
+                continue
+            cog = f"{directory}." + filename.split(".")[0]
+            known = manifest.get(cog)
+            if (
+                filename[:-3] in DEFERRED_COGS
+                and known
+                and known["mtime_ns"] == os.stat(f"{dirname}/{filename}").st_mtime_ns
+            ):
+                # Its commands stay registered with Discord from the last
+                # sync; the cog itself is loaded by their first use
+                self.deferred_commands.update(dict.fromkeys(known["commands"], cog))
+            else:
+                specs[cog] = importlib.util.find_spec(cog)
+
+        # Import every module at once, then run the setups here in order
+        with ThreadPoolExecutor(
+            max_workers=max(len(specs), 1), thread_name_prefix="cog-import"
+        ) as pool:
+            self._preloaded = dict(
+                zip(specs, pool.map(import_extension, specs.values()))
+            )
+
+        for cog in specs:
+            try:
+                self.load_extension(cog)
+            except Exception as e:
+                log.error(f"{cog} failed to load: {e}")
+            else:
+                self.log_extension_profile(cog, parallel=len(specs) > 1)
+        log.info(
+            f"Loaded {len(specs)} cogs in {(time.perf_counter() - start) * 1000:.1f} ms"
+            + format_memory(memory_since(memory))
+            + (
+                f", deferred {', '.join(sorted(self.deferred_extensions))}"
+                if self.deferred_commands
+                else ""
+            )
+        )
+
+    def log_extension_profile(self, extension: str, parallel: bool = False):
+        import_time, import_memory, setup_time, setup_memory = self.extension_profiles[
+            extension
+        ]
+        import_memory = format_memory(import_memory)
+        if parallel and import_memory:
+            # Other cogs were importing at the same time
+            import_memory += " (approximate)"
+        log.info(
+            f"{extension} loaded (import {import_time * 1000:.1f} ms{import_memory}, "
+            f"setup {setup_time * 1000:.1f} ms{format_memory(setup_memory)})"
+        )
+
+    async def load_deferred(self, extension: str):
+        """Load a deferred extension, importing it off the event loop"""
+        if extension not in self.deferred_extensions:
+            return
+        task = self._deferred_loads.get(extension)
+        if task is None:
+            task = asyncio.create_task(self._load_deferred(extension))
+            self._deferred_loads[extension] = task
+            task.add_done_callback(lambda _: self._deferred_loads.pop(extension))
+        await asyncio.shield(task)
+
+    async def _load_deferred(self, extension: str):
+        spec = importlib.util.find_spec(extension)
+        self._preloaded[extension] = await asyncio.to_thread(import_extension, spec)
+        self.load_extension(extension)
+        self.log_extension_profile(extension)
+
+    async def reload_with_state(self, extension: str):
+        """Reload an extension, handing its cogs' state to their replacements
+
+        Cogs opt in by defining an async export_state() returning their
+        in-memory state and an import_state(state) that adopts it.
+        """
+        async with self._reload_lock:
+            states = {}
+            for name, cog in list(self.cogs.items()):
+                if cog.__module__ == extension and hasattr(cog, "export_state"):
+                    states[name] = await cog.export_state()
+            try:
+                self.reload_extension(extension)
+            finally:
+                # On failure these are the rolled back cogs, which need their
+                # state back just the same
+                for name, state in states.items():
+                    cog = self.cogs.get(name)
+                    if cog is not None and hasattr(cog, "import_state"):
+                        cog.import_state(state)
+
+    async def reload_changed_cogs(self) -> list[str]:
+        """Reload cogs whose files changed since they were loaded, and load new ones"""
+        dirname = Path(__file__).parent / self.cogs_directory
+        changed = []
+        for path in sorted(dirname.glob("*.py")):
+            extension = f"{self.cogs_directory}.{path.stem}"
+            if extension in self.deferred_extensions:
+                continue
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            if self.extension_mtimes.get(extension) == mtime:
+                continue
+            # Don't retry a broken file until it changes again
+            self.extension_mtimes[extension] = mtime
+            try:
+                if extension in self.extensions:
+                    await self.reload_with_state(extension)
+                    log.info(f"Reloaded changed cog: {extension}")
                 else:
-                    log.info(f"{cog} loaded")
+                    self.load_extension(extension)
+                    log.info(f"Loaded new cog: {extension}")
+            except Exception as e:
+                log.error(f"Failed to reload {extension}: {e}")
+            else:
+                changed.append(extension)
+        if changed:
+            self.schedule_sync()
+        return changed
+
+    def watch_cogs(self, enabled: bool):
+        """Start or stop reloading cogs when their files change"""
+        if enabled and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_cogs())
+            log.info(f"Watching {self.cogs_directory}/ for changes")
+        elif not enabled and self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+            log.info(f"Stopped watching {self.cogs_directory}/")
+
+    async def _watch_cogs(self):
+        # Polling a handful of mtimes a second is cheaper than it sounds and
+        # needs nothing beyond the standard library
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            await self.reload_changed_cogs()
+
+    async def restart_gracefully(self):
+        """Hand over to a replacement process without dropping commands
+
+        The replacement connects while this process keeps serving. Once it's
+        ready, it takes over new interactions. This process then waits for
+        its commands in progress, flushes cogs with a flush() hook (reminders
+        finish sending and close their database), hands over its ports and
+        tells the replacement to start its own background work before exiting.
+
+        The replacement is started in its own session, so a process manager
+        has to track the bot by something other than its original PID.
+        """
+        ours, theirs = socket.socketpair()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                *sys.argv,
+                pass_fds=[theirs.fileno()],
+                env={**os.environ, "BROBOT_HANDOFF_FD": str(theirs.fileno())},
+                start_new_session=True,
+            )
+        except OSError:
+            ours.close()
+            raise
+        finally:
+            theirs.close()
+        reader, writer = await asyncio.open_connection(sock=ours)
+        try:
+            line = await asyncio.wait_for(reader.readline(), RESTART_READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            line = b""
+        if line != b"ready\n":
+            writer.close()
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            # Reap it rather than leave a zombie behind
+            await process.wait()
+            raise RuntimeError("The replacement process didn't become ready")
+
+        writer.write(b"serve\n")
+        await writer.drain()
+        self.draining = True
+        log.info(f"Replacement process {process.pid} is serving, draining")
+
+        deadline = time.monotonic() + RESTART_DRAIN_TIMEOUT
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        if self.in_flight:
+            log.warning(f"Restarting with {len(self.in_flight)} commands unfinished")
+        for cog in list(self.cogs.values()):
+            if hasattr(cog, "flush"):
+                await cog.flush()
+
+        # Free the ports for the replacement, and wait for it to bind them so
+        # a supervisor never finds the worker without a listener
+        await self.stop_servers()
+        writer.write(b"flushed\n")
+        await writer.drain()
+        try:
+            await asyncio.wait_for(reader.readline(), RESTART_LISTEN_TIMEOUT)
+        except asyncio.TimeoutError:
+            log.warning("The replacement process didn't start listening in time")
+        writer.close()
+        log.info(f"Handed over to process {process.pid}")
+        await self.close()
+
+    async def _take_over(self, fd: int):
+        """Take over from the process that started this one for a restart"""
+        reader, writer = await asyncio.open_connection(sock=socket.socket(fileno=fd))
+        try:
+            try:
+                await self.wait_until_ready()
+                writer.write(b"ready\n")
+                await writer.drain()
+                if await reader.readline() == b"serve\n":
+                    self.serving.set()
+                    log.info("Took over serving interactions")
+                    await reader.readline()
+            except OSError as e:
+                # If the old process went away mid-handoff, carry on regardless
+                log.warning(f"Lost the old process during the handoff: {e}")
+            self.serving.set()
+            # The old process has released its ports by now
+            await self.start_servers()
+            writer.write(b"listening\n")
+            await writer.drain()
+        except OSError as e:
+            log.error(f"Failed to finish the handoff: {e}")
+        finally:
+            self.serving.set()
+            self.handoff_complete.set()
+            writer.close()
+        log.info("Handoff complete")
+
+    async def process_application_commands(
+        self, interaction: discord.Interaction, auto_sync: bool | None = None
+    ):
+        if self.draining or not self.serving.is_set():
+            # The other process of a graceful restart is handling it
+            return
+        name = (interaction.data or {}).get("name")
+        extension = self.deferred_commands.get(name)
+        if extension is not None:
+            try:
+                await self.load_deferred(extension)
+            except Exception as e:
+                log.error(f"Deferred {extension} failed to load: {e}")
+                return
+        command_id = (interaction.data or {}).get("id")
+        if command_id is not None and command_id not in self._application_commands:
+            # Commands from a cog loaded or reloaded since the last sync don't
+            # know their id until it runs, if it needs to at all
+            for command in self.pending_application_commands:
+                if command.name == name and command.guild_ids is None:
+                    command.id = command_id
+                    self._application_commands[command_id] = command
+        await super().process_application_commands(interaction, auto_sync)
+
+    async def on_connect(self):
+        # Dispatched on every shard's READY, all at once, but the commands
+        # only need syncing once; later changes go through schedule_sync
+        if not self.auto_sync_commands:
+            return
+        async with self._sync_lock:
+            if not self._commands_synced:
+                await self.sync_commands()
+                self._commands_synced = True
+
+    def _read_command_state(self) -> dict:
+        try:
+            return json.loads(COMMAND_STATE.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    async def sync_commands(self, *args, **kwargs):
+        """Send Discord only the global commands that changed since the last sync
+
+        Each command's payload is hashed and compared with the hashes saved
+        by the last sync, so an unchanged tree costs no requests at all, even
+        after a restart. Guild commands still use discord.Bot's full sync.
+
+        In a cluster only the first worker syncs. The others take the ids it
+        saved, and commands it hasn't saved yet get theirs when first run.
+        """
+        if self.cluster.worker_id:
+            self._attach_command_ids(self._read_command_state())
+            return
+        if any(cmd.guild_ids for cmd in self.pending_application_commands):
+            await super().sync_commands(*args, **kwargs)
+            return
+
+        payloads = {
+            cmd.name: cmd.to_dict() for cmd in self.pending_application_commands
+        }
+        hashes = {
+            name: hashlib.sha256(
+                json.dumps(payload, sort_keys=True).encode()
+            ).hexdigest()
+            for name, payload in payloads.items()
+        }
+        state = self._read_command_state()
+        app_id = self.application_id
+
+        if not state and not self.deferred_commands:
+            # Nothing to diff against, so replace whatever Discord has
+            registered = await self.http.bulk_upsert_global_commands(
+                app_id, list(payloads.values())
+            )
+            state = {
+                data["name"]: {"hash": hashes[data["name"]], "id": data["id"]}
+                for data in registered
+            }
+            log.info(f"Synced all {len(registered)} commands")
+        else:
+            changed = [
+                name
+                for name, digest in hashes.items()
+                if state.get(name, {}).get("hash") != digest
+            ]
+            # Deferred cogs' commands aren't in the local tree but are still
+            # registered, so they're kept as they are
+            removed = [
+                name
+                for name in state
+                if name not in hashes and name not in self.deferred_commands
+            ]
+            for name in changed:
+                data = await self.http.upsert_global_command(app_id, payloads[name])
+                state[name] = {"hash": hashes[name], "id": data["id"]}
+            for name in removed:
+                await self.http.delete_global_command(app_id, state.pop(name)["id"])
+            if changed or removed:
+                log.info(
+                    f"Synced commands: updated {', '.join(changed) or 'none'}, "
+                    f"removed {', '.join(removed) or 'none'}"
+                )
+            else:
+                log.info("Commands are up to date, skipping sync")
+
+        self._attach_command_ids(state)
+        COMMAND_STATE.write_text(json.dumps(state, indent=2))
+
+    def _attach_command_ids(self, state: dict):
+        for command in self.pending_application_commands:
+            if command.name in state:
+                command.id = state[command.name]["id"]
+                self._application_commands[command.id] = command
+
+    def schedule_sync(self):
+        """Sync commands once no more changes arrive for SYNC_DEBOUNCE seconds"""
+        if self._sync_handle is not None:
+            self._sync_handle.cancel()
+        self._sync_handle = asyncio.get_running_loop().call_later(
+            SYNC_DEBOUNCE, self._start_sync
+        )
+
+    def _start_sync(self):
+        self._sync_handle = None
+        self._sync_task = asyncio.create_task(self._debounced_sync())
+
+    async def _debounced_sync(self):
+        async with self._sync_lock:
+            try:
+                await self.sync_commands()
+            except Exception as e:
+                log.error(f"Failed to sync commands: {e}")
 
 
 description = "Brobot"
@@ -50,7 +707,8 @@ bot = Brobot(description=description, intents=intents)
 
 # Bot event listeners
 @bot.listen()
-async def on_connect():
+async def on_ready():
+    # on_connect would fire once for every shard
     try:
         app_info = await bot.application_info()
         owner = app_info.owner
@@ -58,7 +716,10 @@ async def on_connect():
         if isinstance(owner, discord.Team):
             owner = owner.owner
         if owner:
-            await owner.send(f"{bot.user} connected")
+            message = f"{bot.user} connected"
+            if bot.cluster.worker_count > 1:
+                message += f" as worker {bot.cluster.worker_id}"
+            await owner.send(message)
             log.info(f"Sent connect DM to owner {owner}")
     except Exception as e:
         log.error(f"Failed to fetch application info: {e}")
@@ -67,11 +728,15 @@ async def on_connect():
 # Bot command listeners
 @bot.listen()
 async def on_application_command(ctx: discord.ApplicationContext):
+    bot.in_flight.add(ctx.interaction.id)
+    bot.metrics.command_started(ctx.interaction.id)
     log.info(f"Command '{ctx.command.name}' invoked by {ctx.author}")
 
 
 @bot.listen()
 async def on_application_command_completion(ctx: discord.ApplicationContext):
+    bot.in_flight.discard(ctx.interaction.id)
+    bot.metrics.command_finished(ctx.interaction.id, ctx.command.qualified_name)
     log.info(f"Command '{ctx.command.name}' completed for {ctx.author}")
 
 
@@ -79,6 +744,12 @@ async def on_application_command_completion(ctx: discord.ApplicationContext):
 async def on_application_command_error(
     ctx: discord.ApplicationContext, error: Exception
 ):
+    bot.in_flight.discard(ctx.interaction.id)
+    bot.metrics.command_finished(
+        ctx.interaction.id,
+        ctx.command.qualified_name,
+        getattr(error, "original", error),
+    )
     log.error(f"Error in command '{ctx.command.name}' invoked by {ctx.author}: {error}")
 
 
@@ -93,48 +764,83 @@ bot_group = bot.create_group("bot", "Commands for managing bot operations")
 
 @bot_group.command(name="restart")
 @commands.is_owner()
-async def restart(ctx: discord.ApplicationContext):
+@discord.option(
+    "graceful",
+    description="Hand over to a new process instead of relying on a process manager",
+    default=False,
+)
+async def restart(ctx: discord.ApplicationContext, graceful: bool):
     """Restart the bot"""
     embed = discord.Embed(
         title="✅ Restart",
-        description=f"The bot is restarting",
+        description=(
+            "Starting a replacement process" if graceful else "The bot is restarting"
+        ),
         color=discord.Color.blurple(),
     )
     await ctx.respond(embed=embed, ephemeral=True)
-    await bot.close()
-    # Note: Actual restart logic (e.g., via a process manager) is not handled here.
+    if not graceful:
+        await bot.close()
+        # Note: Actual restart logic (e.g., via a process manager) is not handled here.
+        return
+
+    # Don't wait for this command itself while draining
+    bot.in_flight.discard(ctx.interaction.id)
+    try:
+        await bot.restart_gracefully()
+    except Exception as e:
+        embed = discord.Embed(
+            title="❌ Restart Failed",
+            description=f"```{e}```",
+            color=discord.Color.red(),
+        )
+        await ctx.followup.send(embed=embed, ephemeral=True)
+        log.error(f"Graceful restart failed: {e}")
 
 
 @bot_group.command(name="update")
 @commands.is_owner()
 async def update(ctx: discord.ApplicationContext):
     """Update with the latest changes from the repository"""
+    await ctx.defer(ephemeral=True)
     try:
-        result = subprocess.run(
-            ["git", "pull"],
-            capture_output=True,
-            text=True,
-            timeout=30,
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "pull",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        if result.returncode == 0:
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+        except asyncio.TimeoutError:
+            process.kill()
+            raise
+        if process.returncode == 0:
+            reloaded = await bot.reload_changed_cogs()
             embed = discord.Embed(
                 title="✅ Update Successful",
-                description=f"```{result.stdout}```",
+                description=f"```{stdout.decode()}```",
                 color=discord.Color.green(),
             )
+            if reloaded:
+                embed.add_field(
+                    name="Reloaded",
+                    value="\n".join(f"• {ext}" for ext in reloaded),
+                    inline=False,
+                )
         else:
             embed = discord.Embed(
                 title="❌ Update Failed",
-                description=f"```{result.stderr}```",
+                description=f"```{stderr.decode()}```",
                 color=discord.Color.red(),
             )
         await ctx.respond(embed=embed, ephemeral=True)
-        log.info(f"Git pull executed by {ctx.author}: {result.returncode}")
+        log.info(f"Git pull executed by {ctx.author}: {process.returncode}")
 
     except Exception as e:
         embed = discord.Embed(
             title="❌ Update Error",
-            description=f"```{str(e)}```",
+            description=f"```{str(e) or type(e).__name__}```",
             color=discord.Color.red(),
         )
         await ctx.respond(embed=embed, ephemeral=True)
@@ -171,6 +877,132 @@ async def latency(ctx: discord.ApplicationContext):
     await ctx.respond(embed=embed, ephemeral=True)
 
 
+@bot_group.command(name="stats")
+@commands.is_owner()
+async def stats(ctx: discord.ApplicationContext):
+    """Show command, upstream and event loop timings"""
+    metrics = bot.metrics
+    embed = discord.Embed(title="Bot Stats", color=discord.Color.blurple())
+
+    errors = {}
+    for (command, _), count in metrics.command_errors.items():
+        errors[command] = errors.get(command, 0) + count
+    busiest = sorted(metrics.commands.items(), key=lambda item: -item[1].count)[:10]
+    embed.add_field(
+        name="Commands",
+        value="\n".join(
+            f"`/{command}` {h.count:,} calls | avg {h.mean * 1000:.0f} ms | "
+            f"p95 ≤ {h.quantile(0.95) * 1000:.0f} ms | {errors.get(command, 0)} errors"
+            for command, h in busiest
+        )
+        or "none yet",
+        inline=False,
+    )
+    embed.add_field(
+        name="Upstream",
+        value="\n".join(
+            f"`{cog} {call}` {h.count:,} calls | avg {h.mean * 1000:.0f} ms | "
+            f"p95 ≤ {h.quantile(0.95) * 1000:.0f} ms | "
+            f"{metrics.upstream_errors.get((cog, call), 0)} errors"
+            for (cog, call), h in sorted(metrics.upstream.items())
+        )
+        or "none yet",
+        inline=False,
+    )
+    lag = metrics.loop_lag
+    embed.add_field(
+        name="Event Loop Lag",
+        value=f"last {metrics.last_loop_lag * 1000:.1f} ms | "
+        f"avg {lag.mean * 1000:.1f} ms | p99 ≤ {lag.quantile(0.99) * 1000:.0f} ms",
+        inline=False,
+    )
+    await ctx.respond(embed=embed, ephemeral=True)
+
+
+@bot_group.command(name="stalls")
+@commands.is_owner()
+async def stalls(ctx: discord.ApplicationContext):
+    """Show recent event loop stalls and where they happened"""
+    recent = list(bot.watchdog.stalls)[-10:]
+    if not recent:
+        embed = discord.Embed(
+            title="Event Loop Stalls",
+            description=f"No stalls over {bot.watchdog.threshold}s recorded.",
+            color=discord.Color.green(),
+        )
+        await ctx.respond(embed=embed, ephemeral=True)
+        return
+
+    embed = discord.Embed(
+        title="Event Loop Stalls",
+        description="\n".join(
+            f"{stall['time'].strftime('%Y-%m-%d %H:%M:%S')} | "
+            + (
+                f"{stall['duration']:.2f}s"
+                if stall["duration"] is not None
+                else "ongoing"
+            )
+            + f" | `{stall['where']}`"
+            for stall in reversed(recent)
+        ),
+        color=discord.Color.orange(),
+    )
+    # The innermost frames of the latest stall, within the field size limit
+    stack = "".join(recent[-1]["stack"][-4:])[-990:]
+    embed.add_field(name="Latest Stack", value=f"```{stack}```", inline=False)
+    await ctx.respond(embed=embed, ephemeral=True)
+
+
+@bot_group.command(name="cluster")
+@commands.is_owner()
+async def cluster(ctx: discord.ApplicationContext):
+    """Show the health of every worker and shard in the cluster"""
+    await ctx.defer(ephemeral=True)
+    workers = await bot.cluster.health()
+    healthy = all(isinstance(h, dict) and h["healthy"] for h in workers.values())
+    embed = discord.Embed(
+        title="Cluster Health",
+        description=f"{len(workers)} workers | {bot.cluster.shard_count or len(bot.shards)} shards",
+        color=discord.Color.green() if healthy else discord.Color.red(),
+    )
+    # Embeds are limited to 25 fields
+    for worker, health in list(workers.items())[:25]:
+        if not isinstance(health, dict):
+            embed.add_field(
+                name=f"❌ Worker {worker}", value=f"Unreachable: {health}", inline=False
+            )
+            continue
+        shards = " ".join(
+            f"`{shard_id}` "
+            + (
+                "closed"
+                if shard["closed"]
+                else (
+                    f"{shard['latency'] * 1000:.0f} ms"
+                    if shard["latency"] is not None
+                    else "connecting"
+                )
+            )
+            for shard_id, shard in health["shards"].items()
+        )
+        embed.add_field(
+            name=f"{'✅' if health['healthy'] else '❌'} Worker {worker} (PID {health['pid']})",
+            value=(
+                f"{health['guilds']:,} guilds | {health['in_flight']} in flight | "
+                f"lag {health['loop_lag'] * 1000:.1f} ms | "
+                + (
+                    f"{health['memory'] / 2**20:,.0f} MiB | "
+                    if health["memory"] is not None
+                    else ""
+                )
+                + f"up {timedelta(seconds=int(health['uptime']))}\n"
+                f"Shards: {shards or 'none yet'}"
+            ),
+            inline=False,
+        )
+    await ctx.respond(embed=embed, ephemeral=True)
+
+
 # Cogs commands
 cogs_group = bot.create_group("cogs", "Commands for managing bot cogs")
 
@@ -194,6 +1026,12 @@ async def list_cogs(ctx: discord.ApplicationContext):
             color=discord.Color.blurple(),
         )
         embed.set_footer(text=f"Total: {len(loaded_cogs)} cogs")
+    if bot.deferred_commands:
+        embed.add_field(
+            name="Deferred",
+            value="\n".join(f"• {ext}" for ext in sorted(bot.deferred_extensions)),
+            inline=False,
+        )
 
     await ctx.respond(embed=embed, ephemeral=True)
 
@@ -209,12 +1047,12 @@ async def list_cogs(ctx: discord.ApplicationContext):
 async def reload_cog(ctx: discord.ApplicationContext, cog: str):
     """Reload a specific cog"""
     try:
-        bot.reload_extension(f"cogs.{cog.lower()}")
+        await bot.reload_with_state(f"cogs.{cog.lower()}")
         embed = discord.Embed(
             description=f"Successfully reloaded `{cog}`",
             color=discord.Color.green(),
         )
-        await bot.sync_commands()
+        bot.schedule_sync()
         log.info(f"Reloaded cog: {cog}")
     except Exception as e:
         embed = discord.Embed(
@@ -243,7 +1081,7 @@ async def unload_cog(ctx: discord.ApplicationContext, cog: str):
             description=f"Successfully unloaded `{cog}`",
             color=discord.Color.green(),
         )
-        await bot.sync_commands()
+        bot.schedule_sync()
         log.info(f"Unloaded cog: {cog}")
     except Exception as e:
         embed = discord.Embed(
@@ -256,6 +1094,23 @@ async def unload_cog(ctx: discord.ApplicationContext, cog: str):
     await ctx.respond(embed=embed, ephemeral=True)
 
 
+@cogs_group.command(name="watch")
+@commands.is_owner()
+@discord.option("enabled", description="Reload cogs when their files change")
+async def watch_cogs(ctx: discord.ApplicationContext, enabled: bool):
+    """Turn reloading cogs on file change on or off"""
+    bot.watch_cogs(enabled)
+    embed = discord.Embed(
+        description=(
+            f"Watching `{bot.cogs_directory}/` for changes"
+            if enabled
+            else "Stopped watching for changes"
+        ),
+        color=discord.Color.green(),
+    )
+    await ctx.respond(embed=embed, ephemeral=True)
+
+
 @cogs_group.command(name="load")
 @commands.is_owner()
 @discord.option("cog", description="The name of the cog to load", required=True)
@@ -267,7 +1122,7 @@ async def load_cog(ctx: discord.ApplicationContext, cog: str):
             description=f"Successfully loaded `{cog}`",
             color=discord.Color.green(),
         )
-        await bot.sync_commands()
+        bot.schedule_sync()
         log.info(f"Loaded cog: {cog}")
     except Exception as e:
         embed = discord.Embed(
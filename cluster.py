@@ -0,0 +1,345 @@
+import asyncio
+import hmac
+import logging
+import math
+import os
+import secrets
+import signal
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import aiohttp
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+DISCORD_GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+BROBOT = Path(__file__).parent / "brobot.py"
+# Discord allows max_concurrency IDENTIFYs every IDENTIFY_INTERVAL seconds,
+# so workers are started far enough apart not to compete for them
+IDENTIFY_INTERVAL = 5
+# Workers that die are restarted after a delay that doubles while they keep
+# dying within WORKER_STABLE_AFTER seconds of starting
+RESTART_BASE_DELAY = 1
+RESTART_MAX_DELAY = 60
+WORKER_STABLE_AFTER = 60
+HEALTH_TIMEOUT = 5
+# Workers call each other's handlers on RPC_PORT plus their worker id. The
+# RPC listener is kept off the metrics one, which may be opened up to a
+# scraper, and only ever binds to loopback.
+RPC_HOST = "127.0.0.1"
+RPC_PORT = int(os.environ.get("BROBOT_CLUSTER_RPC_PORT", "9208"))
+
+
+class RemoteError(Exception):
+    """A handler on another worker raised"""
+
+
+class Cluster:
+    """This process's place in the cluster
+
+    A process started without the launcher is a cluster of one that owns
+    every shard and every key.
+    """
+
+    def __init__(
+        self,
+        worker_id: int = 0,
+        worker_count: int = 1,
+        shard_count: int | None = None,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        secret: str = "",
+    ):
+        self.worker_id = worker_id
+        self.worker_count = worker_count
+        self.shard_count = shard_count
+        self.host = host
+        self.base_port = base_port
+        # Shared by the workers of a cluster and required on every RPC call
+        self.secret = secret
+        self._runner: web.AppRunner | None = None
+        # name -> coroutine function other workers can call with keyword args
+        self.handlers: dict[str, Callable[..., Awaitable[Any]]] = {}
+        # Set by the bot once it has an HTTP session
+        self.session: aiohttp.ClientSession | None = None
+        # This worker's own health, answered without a request
+        self.local_health: Callable[[], dict] | None = None
+
+    @classmethod
+    def from_env(cls, host: str, base_port: int) -> "Cluster":
+        shard_count = os.environ.get("BROBOT_SHARD_COUNT")
+        return cls(
+            worker_id=int(os.environ.get("BROBOT_WORKER_ID", "0")),
+            worker_count=int(os.environ.get("BROBOT_WORKERS", "1")),
+            shard_count=int(shard_count) if shard_count else None,
+            host=host,
+            base_port=base_port,
+            secret=os.environ.get("BROBOT_CLUSTER_SECRET", ""),
+        )
+
+    @property
+    def shard_ids(self) -> list[int] | None:
+        """This worker's shards, or None to run every shard Discord recommends"""
+        if self.shard_count is None:
+            return None
+        return list(range(self.worker_id, self.shard_count, self.worker_count))
+
+    @property
+    def port(self) -> int:
+        return self.port_of(self.worker_id)
+
+    def port_of(self, worker: int) -> int:
+        return self.base_port + worker if self.base_port else 0
+
+    def shard_of(self, guild_id: int | None) -> int:
+        """Return the shard that receives a guild's events; DMs go to shard 0"""
+        if not guild_id or self.shard_count is None:
+            return 0
+        return (guild_id >> 22) % self.shard_count
+
+    def worker_of(self, guild_id: int | None) -> int:
+        """Return the worker that receives a guild's events"""
+        return self.shard_of(guild_id) % self.worker_count
+
+    def owns_guild(self, guild_id: int | None) -> bool:
+        return self.worker_of(guild_id) == self.worker_id
+
+    def owner(self, key: str) -> int:
+        """Return the worker that caches a key"""
+        # crc32 rather than hash(), which is salted differently per process
+        return zlib.crc32(key.encode()) % self.worker_count
+
+    async def start(self):
+        """Start serving handlers to the other workers, if there are any"""
+        if self.worker_count == 1:
+            return
+        if not self.secret:
+            raise RuntimeError("BROBOT_CLUSTER_SECRET must be set for a cluster")
+        app = web.Application()
+        app.router.add_post("/cluster/{name}", self._handle_call)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, RPC_HOST, RPC_PORT + self.worker_id).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_call(self, request: web.Request) -> web.Response:
+        token = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(token, f"Bearer {self.secret}"):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        name = request.match_info["name"]
+        handler = self.handlers.get(name)
+        if handler is None:
+            return web.json_response({"error": f"No handler {name}"}, status=404)
+        try:
+            result = await handler(**await request.json())
+        except Exception as e:
+            log.error(f"Error handling {name} for another worker: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+        return web.json_response({"result": result})
+
+    async def call(self, worker: int, name: str, **params) -> Any:
+        """Call a handler on another worker
+
+        Raises RemoteError if the handler raised, and aiohttp.ClientError if
+        the worker couldn't be reached.
+        """
+        url = f"http://{RPC_HOST}:{RPC_PORT + worker}/cluster/{name}"
+        async with self.session.post(
+            url, json=params, headers={"Authorization": f"Bearer {self.secret}"}
+        ) as response:
+            body = await response.json()
+        if "error" in body:
+            raise RemoteError(body["error"])
+        return body["result"]
+
+    async def worker_health(self, worker: int) -> dict | str:
+        """Return a worker's health, or why it couldn't be fetched"""
+        if worker == self.worker_id and self.local_health is not None:
+            return self.local_health()
+        url = f"http://{self.host}:{self.port_of(worker)}/health"
+        try:
+            async with self.session.get(
+                url, timeout=aiohttp.ClientTimeout(total=HEALTH_TIMEOUT)
+            ) as response:
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return str(e) or type(e).__name__
+
+    async def health(self) -> dict[int, dict | str]:
+        """Return every worker's health"""
+        workers = range(self.worker_count)
+        return dict(
+            zip(workers, await asyncio.gather(*map(self.worker_health, workers)))
+        )
+
+
+class Launcher:
+    """Start, watch and restart the worker processes of a cluster
+
+    Run with `python cluster.py`. The bot's shards are split over
+    BROBOT_WORKERS processes, each running brobot.py as an AutoShardedBot
+    with its share of them. Workers call each other over loopback, so the
+    whole cluster runs on one host.
+    """
+
+    def __init__(self, cluster: Cluster, max_concurrency: int):
+        self.cluster = cluster
+        self.max_concurrency = max_concurrency
+        # worker -> PID of the process currently running it
+        self.pids: dict[int, int] = {}
+        self._runner: web.AppRunner | None = None
+
+    def worker_env(self, worker: int) -> dict[str, str]:
+        return {
+            **os.environ,
+            "BROBOT_WORKER_ID": str(worker),
+            "BROBOT_WORKERS": str(self.cluster.worker_count),
+            "BROBOT_SHARD_COUNT": str(self.cluster.shard_count),
+            "BROBOT_CLUSTER_SECRET": self.cluster.secret,
+        }
+
+    async def run(self, port: int):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        async with aiohttp.ClientSession() as session:
+            self.cluster.session = session
+            await self.serve_health(port)
+            supervisors: list[asyncio.Task] = []
+            starting = asyncio.create_task(self.start_workers(supervisors))
+            await stop.wait()
+
+            log.info("Stopping workers")
+            for task in [starting, *supervisors]:
+                task.cancel()
+            for pid in self.pids.values():
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            if self._runner is not None:
+                await self._runner.cleanup()
+
+    async def start_workers(self, supervisors: list[asyncio.Task]):
+        shards_per_worker = math.ceil(
+            self.cluster.shard_count / self.cluster.worker_count
+        )
+        for worker in range(self.cluster.worker_count):
+            if worker:
+                await asyncio.sleep(
+                    IDENTIFY_INTERVAL * shards_per_worker / self.max_concurrency
+                )
+            supervisors.append(asyncio.create_task(self.supervise(worker)))
+
+    async def supervise(self, worker: int):
+        delay = RESTART_BASE_DELAY
+        while True:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, str(BROBOT), env=self.worker_env(worker)
+            )
+            self.pids[worker] = process.pid
+            started = time.monotonic()
+            log.info(f"Started worker {worker} as process {process.pid}")
+            await process.wait()
+
+            # A graceful restart leaves a replacement process serving on the
+            # worker's port, which is watched instead of starting another
+            pid = process.pid
+            while (pid := await self._replacement(worker, pid)) is not None:
+                log.info(f"Worker {worker} was handed over to process {pid}")
+                self.pids[worker] = pid
+                started = time.monotonic()
+                await self._wait_for_exit(pid)
+
+            if time.monotonic() - started > WORKER_STABLE_AFTER:
+                delay = RESTART_BASE_DELAY
+            log.warning(f"Worker {worker} exited, restarting in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RESTART_MAX_DELAY)
+
+    async def _replacement(self, worker: int, pid: int) -> int | None:
+        """Return the PID now serving a worker, if it isn't the one that exited"""
+        health = await self.cluster.worker_health(worker)
+        if isinstance(health, dict) and health["pid"] != pid:
+            return health["pid"]
+        return None
+
+    async def _wait_for_exit(self, pid: int):
+        # Not our child, so it can't be waited for
+        while True:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return
+            await asyncio.sleep(1)
+
+    async def serve_health(self, port: int):
+        """Serve every worker's health on /health, unless port is 0"""
+        if not port:
+            return
+        app = web.Application()
+        app.router.add_get("/health", self._handle_health)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.cluster.host, port).start()
+        log.info(f"Serving cluster health on http://{self.cluster.host}:{port}/health")
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        workers = await self.cluster.health()
+        healthy = all(
+            isinstance(health, dict) and health["healthy"]
+            for health in workers.values()
+        )
+        return web.json_response(
+            {"healthy": healthy, "workers": {str(w): h for w, h in workers.items()}},
+            status=200 if healthy else 503,
+        )
+
+
+async def fetch_gateway(token: str) -> dict:
+    """Return Discord's recommended shard count and IDENTIFY limits"""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            DISCORD_GATEWAY_URL, headers={"Authorization": f"Bot {token}"}
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+async def main():
+    gateway = await fetch_gateway(os.environ["BROBOT_TOKEN"])
+    shard_count = int(os.environ.get("BROBOT_SHARD_COUNT") or gateway["shards"])
+    workers = int(os.environ.get("BROBOT_WORKERS") or os.cpu_count() or 1)
+    cluster = Cluster(
+        # A worker without shards would have nothing to do
+        worker_count=max(1, min(workers, shard_count)),
+        shard_count=shard_count,
+        host=os.environ.get("BROBOT_METRICS_HOST", "127.0.0.1"),
+        base_port=int(os.environ.get("BROBOT_METRICS_PORT", "9108")),
+        secret=os.environ.get("BROBOT_CLUSTER_SECRET") or secrets.token_urlsafe(32),
+    )
+    if not cluster.base_port:
+        sys.exit("Workers report their health on their metrics ports")
+    log.info(f"Running {cluster.shard_count} shards on {cluster.worker_count} workers")
+    launcher = Launcher(
+        cluster, gateway["session_start_limit"].get("max_concurrency", 1)
+    )
+    await launcher.run(int(os.environ.get("BROBOT_CLUSTER_PORT", "9107")))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.environ.get("BROBOT_LOGLEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)-8s %(module)-s: %(funcName)s: %(message)s",
+    )
+    asyncio.run(main())
@@ -1,40 +1,362 @@
+import asyncio
+import json
 import logging
-
 import os
+import random
 import re
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
 import aiohttp
 import discord
-from datetime import datetime
+from discord.commands import SlashCommandGroup
+from discord.ext import commands
+
+from sqlite_store import DATA_DIR, SqliteStore
 
 log = logging.getLogger(__name__)
 
 NASA_APOD_URL = "https://apod-api.sudos.site/v1/apod/"
 API_KEY = os.environ["APOD_API_KEY"]
+DB_PATH = DATA_DIR / "apod.db"
+
+FIRST_APOD_DATE = date(1995, 6, 16)
+# A new picture is published at midnight US Eastern time. Entries for earlier
+# dates never change, so they're cached forever.
+PUBLISH_TZ = ZoneInfo("America/New_York")
+# Entries kept in memory in front of the on-disk cache
+MEMORY_CACHE_SIZE = 256
+# Days requested per start_date/end_date call when prefetching
+PREFETCH_CHUNK_DAYS = 100
+# /apod browse shows BROWSE_PAGE_SIZE entries per page, over at most
+# BROWSE_MAX_DAYS days so a browse never triggers a huge prefetch
+BROWSE_PAGE_SIZE = 10
+BROWSE_DEFAULT_DAYS = 30
+BROWSE_MAX_DAYS = 366
+MEDIA_ICONS = {"image": "🖼️", "video": "🎬"}
+
+_DATE_RE = re.compile(
+    r"(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})"
+    r"|(?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})"
+)
+
+
+# One pass over a video url finds a YouTube or Vimeo id in any of the shapes
+# APOD links use: watch, embed, shorts, live and youtu.be links, with or
+# without www/m/player subdomains and extra query parameters
+_VIDEO_RE = re.compile(
+    r"(?:https?:)?//(?:[\w-]+\.)*?(?:"
+    r"(?:youtube(?:-nocookie)?\.com/(?:watch\?(?:[^#\s]*?&)?v=|(?:embed|shorts|live|v)/)"
+    r"|youtu\.be/)(?P<youtube>[\w-]{11})"
+    r"|vimeo\.com/(?:video/|channels/[\w-]+/|groups/[\w-]+/videos/)?(?P<vimeo>\d+)"
+    r")",
+    re.IGNORECASE,
+)
+VIDEO_PROVIDERS = {
+    "youtube": (
+        "YouTube",
+        "https://www.youtube.com/watch?v={}",
+        "https://img.youtube.com/vi/{}/hqdefault.jpg",
+    ),
+    "vimeo": ("Vimeo", "https://vimeo.com/{}", None),
+}
+
+
+def resolve_media(entry: dict) -> dict:
+    """Return an entry's media details, resolved once when it's cached
 
+    Videos get their provider, id, canonical watch url and a still image:
+    the provider's thumbnail where it has a predictable one, otherwise the
+    thumbnail upstream sends along with the entry.
+    """
+    url = entry.get("url", "")
+    media_type = entry.get("media_type", "image")
+    if media_type != "video":
+        return {
+            "provider": None,
+            "video_id": None,
+            "watch_url": None,
+            "image_url": url if media_type == "image" else None,
+        }
 
-def extract_youtube_id(url: str) -> str:
-    """Extract YouTube video ID from various URL formats"""
-    # Format: youtu.be/VIDEO_ID
-    match = re.search(r"youtu\.be/([a-zA-Z0-9_-]+)", url)
-    if match:
-        return match.group(1)
-    # Format: youtube.com/watch?v=VIDEO_ID
-    match = re.search(r"youtube\.com/watch\?v=([a-zA-Z0-9_-]+)", url)
-    if match:
-        return match.group(1)
-    # Format: youtube.com/embed/VIDEO_ID
-    match = re.search(r"youtube\.com/embed/([a-zA-Z0-9_-]+)", url)
-    if match:
-        return match.group(1)
-    return None
+    media = {
+        "provider": None,
+        "video_id": None,
+        "watch_url": url,
+        "image_url": entry.get("thumbnail_url"),
+    }
+    m = _VIDEO_RE.search(url)
+    if m:
+        provider = m.lastgroup
+        _, watch_url, thumbnail_url = VIDEO_PROVIDERS[provider]
+        media["provider"] = provider
+        media["video_id"] = m[provider]
+        media["watch_url"] = watch_url.format(m[provider])
+        if thumbnail_url:
+            media["image_url"] = thumbnail_url.format(m[provider])
+    return media
 
 
-def convert_to_youtube_watch_url(url: str) -> str:
-    """Convert any YouTube URL to the standard watch URL format"""
-    video_id = extract_youtube_id(url)
-    if video_id:
-        return f"https://www.youtube.com/watch?v={video_id}"
-    return url
+def ingest(entry: dict) -> dict:
+    """Prepare an API entry for caching"""
+    return {**entry, "media": resolve_media(entry)}
+
+
+def parse_date(value: str) -> date | None:
+    """Parse a date in MM/DD/YYYY or YYYY-MM-DD format"""
+    m = _DATE_RE.fullmatch(value.strip())
+    if m is None:
+        return None
+    try:
+        if m["year"]:
+            return date(int(m["year"]), int(m["month"]), int(m["day"]))
+        return date(int(m["iso_year"]), int(m["iso_month"]), int(m["iso_day"]))
+    except ValueError:
+        return None
+
+
+def publish_today() -> date:
+    """Return the date of the latest APOD, which changes at midnight PUBLISH_TZ"""
+    return datetime.now(PUBLISH_TZ).date()
+
+
+def expires_at(day: str) -> int | None:
+    """Return when a cached entry goes stale, or None if it never does"""
+    today = publish_today()
+    if date.fromisoformat(day) < today:
+        return None
+    rollover = today + timedelta(days=1)
+    return int(
+        datetime(
+            rollover.year, rollover.month, rollover.day, tzinfo=PUBLISH_TZ
+        ).timestamp()
+    )
+
+
+def _create_apod_table(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE apod (
+            date TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at INTEGER
+        ) WITHOUT ROWID
+    """
+    )
+
+
+def _add_apod_index(conn: sqlite3.Connection):
+    """Index entry metadata by date ordinal for random picks and browsing"""
+    conn.execute(
+        """
+        CREATE TABLE apod_index (
+            day INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            media_type TEXT NOT NULL,
+            url TEXT NOT NULL
+        )
+    """
+    )
+    # julianday of 0001-01-01 is ordinal 1
+    conn.execute(
+        """
+        INSERT INTO apod_index (day, title, media_type, url)
+        SELECT
+            CAST(julianday(date) - julianday('0001-01-01') AS INTEGER) + 1,
+            COALESCE(json_extract(data, '$.title'), ''),
+            COALESCE(json_extract(data, '$.media_type'), 'image'),
+            COALESCE(json_extract(data, '$.url'), '')
+        FROM apod
+    """
+    )
+
+
+def _resolve_cached_media(conn: sqlite3.Connection):
+    """Store resolved media details with entries cached before they were"""
+    rows = conn.execute("SELECT date, data FROM apod").fetchall()
+    conn.executemany(
+        "UPDATE apod SET data = ? WHERE date = ?",
+        ((json.dumps(ingest(json.loads(data))), day) for day, data in rows),
+    )
+
+
+# Schema migrations, applied in order and tracked in user_version
+MIGRATIONS = [
+    _create_apod_table,
+    _add_apod_index,
+    _resolve_cached_media,
+]
+
+
+class ApodStore(SqliteStore):
+    """On-disk cache of APOD API responses keyed by date"""
+
+    name = "apod"
+    migrations = MIGRATIONS
+
+    def _get(self, day: str) -> tuple[dict, int | None] | None:
+        row = self.conn.execute(
+            "SELECT data, expires_at FROM apod WHERE date = ?", (day,)
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _put(self, entries: list[dict]):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO apod (date, data, expires_at) VALUES (?, ?, ?)",
+                (
+                    (entry["date"], json.dumps(entry), expires_at(entry["date"]))
+                    for entry in entries
+                ),
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO apod_index (day, title, media_type, url) VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        date.fromisoformat(entry["date"]).toordinal(),
+                        entry.get("title", ""),
+                        entry.get("media_type", "image"),
+                        entry.get("url", ""),
+                    )
+                    for entry in entries
+                ),
+            )
+
+    def _cached_dates(self, start: str, end: str) -> set[str]:
+        rows = self.conn.execute(
+            """
+            SELECT date FROM apod
+            WHERE date BETWEEN ? AND ? AND (expires_at IS NULL OR expires_at > ?)
+        """,
+            (start, end, int(time.time())),
+        )
+        return {row[0] for row in rows}
+
+    def _count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM apod").fetchone()[0]
+
+    def _random(self) -> tuple | None:
+        # Index rows are keyed by date, so counting and skipping to a random
+        # offset picks uniformly even across the gaps in the archive
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM apod_index").fetchone()
+        if not count:
+            return None
+        return self.conn.execute(
+            "SELECT day, title, media_type, url FROM apod_index ORDER BY day LIMIT 1 OFFSET ?",
+            (random.randrange(count),),
+        ).fetchone()
+
+    def _index_count(self, start: int, end: int) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM apod_index WHERE day BETWEEN ? AND ?", (start, end)
+        ).fetchone()[0]
+
+    def _index_page(self, start: int, end: int, offset: int, limit: int) -> list:
+        return self.conn.execute(
+            """
+            SELECT day, title, media_type, url FROM apod_index
+            WHERE day BETWEEN ? AND ?
+            ORDER BY day DESC LIMIT ? OFFSET ?
+        """,
+            (start, end, limit, offset),
+        ).fetchall()
+
+    async def get(self, day: str) -> tuple[dict, int | None] | None:
+        """Return a cached entry and its expiry, if it's cached and fresh"""
+        return await self._run(self._get, day)
+
+    async def put(self, entries: list[dict]):
+        """Cache API entries, replacing any already cached for their dates"""
+        await self._run(self._put, entries)
+
+    async def cached_dates(self, start: date, end: date) -> set[str]:
+        """Return the dates between start and end with a fresh cached entry"""
+        return await self._run(self._cached_dates, start.isoformat(), end.isoformat())
+
+    async def count(self) -> int:
+        """Return the number of cached entries"""
+        return await self._run(self._count)
+
+    async def random(self) -> tuple[date, str, str, str] | None:
+        """Return the (date, title, media type, url) of a random indexed entry"""
+        row = await self._run(self._random)
+        return (date.fromordinal(row[0]), *row[1:]) if row else None
+
+    async def index_count(self, start: date, end: date) -> int:
+        """Return the number of indexed entries between start and end"""
+        return await self._run(self._index_count, start.toordinal(), end.toordinal())
+
+    async def index_page(
+        self, start: date, end: date, offset: int, limit: int
+    ) -> list[tuple[date, str, str, str]]:
+        """Return a page of indexed entries between start and end, newest first"""
+        rows = await self._run(
+            self._index_page, start.toordinal(), end.toordinal(), offset, limit
+        )
+        return [(date.fromordinal(row[0]), *row[1:]) for row in rows]
+
+
+class ApodBrowser(discord.ui.View):
+    """Pages through the indexed APOD entries in a date range"""
+
+    def __init__(
+        self,
+        store: ApodStore,
+        author: discord.abc.User,
+        start: date,
+        end: date,
+        total: int,
+    ):
+        super().__init__(timeout=300, disable_on_timeout=True)
+        self.store = store
+        self.author = author
+        self.start = start
+        self.end = end
+        self.page = 0
+        self.pages = max(1, -(-total // BROWSE_PAGE_SIZE))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user == self.author
+
+    async def render(self) -> discord.Embed:
+        """Build the embed for the current page and update the buttons"""
+        rows = await self.store.index_page(
+            self.start, self.end, self.page * BROWSE_PAGE_SIZE, BROWSE_PAGE_SIZE
+        )
+        embed = discord.Embed(
+            title="APOD Archive",
+            description="\n".join(
+                f"`{day}` {MEDIA_ICONS.get(media_type, '📄')} "
+                + (f"[{title}]({url})" if url else title)
+                for day, title, media_type, url in rows
+            ),
+            color=discord.Color.dark_blue(),
+        )
+        embed.set_footer(
+            text=f"📅 {self.start} to {self.end} | Page {self.page + 1}/{self.pages}"
+        )
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.pages - 1
+        return embed
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(
+        self, button: discord.ui.Button, interaction: discord.Interaction
+    ):
+        self.page -= 1
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(
+        self, button: discord.ui.Button, interaction: discord.Interaction
+    ):
+        self.page += 1
+        await interaction.response.edit_message(embed=await self.render(), view=self)
 
 
 class APOD(discord.Cog):
@@ -42,76 +364,95 @@ class APOD(discord.Cog):
 
     def __init__(self, bot: discord.Bot):
         self.bot = bot
+        self.store = ApodStore(DB_PATH, bot.metrics)
+        # date -> (entry, expiry), least recently used first
+        self._entries: OrderedDict[str, tuple[dict, int | None]] = OrderedDict()
 
-    @discord.slash_command(name="apod")
-    @discord.option(
-        "date",
-        description="Any date after June 16, 1995, in MM/DD/YYYY or YYYY-MM-DD format",
-        required=False,
-    )
-    async def apod(self, ctx: discord.ApplicationContext, date: str = None):
-        """Show NASA's Astronomy Picture of the Day"""
-        await ctx.defer()
-
-        if date is None:
-            date = datetime.now()
-        else:
-            date_obj = None
-            for fmt in ["%m/%d/%Y", "%Y-%m-%d"]:
-                try:
-                    date_obj = datetime.strptime(date, fmt)
-                    break
-                except ValueError:
-                    continue
-
-            if date_obj is None:
-                embed = discord.Embed(
-                    title="❌ Invalid Date Format",
-                    description="Please use MM/DD/YYYY or YYYY-MM-DD format (e.g., 01/15/2024 or 2024-01-15)",
-                    color=discord.Color.red(),
-                )
-                await ctx.respond(embed=embed, ephemeral=True)
-                return
+    def cog_unload(self):
+        asyncio.create_task(self.store.close())
 
-            first_apod_date = datetime(1995, 6, 16)
-            if date_obj < first_apod_date:
-                embed = discord.Embed(
-                    title="❌ Date Too Early",
-                    description="APOD pictures are only available from June 16, 1995 onwards.",
-                    color=discord.Color.red(),
-                )
-                await ctx.respond(embed=embed, ephemeral=True)
-                return
+    def _remember(self, day: str, entry: dict, expiry: int | None):
+        self._entries[day] = (entry, expiry)
+        self._entries.move_to_end(day)
+        while len(self._entries) > MEMORY_CACHE_SIZE:
+            self._entries.popitem(last=False)
 
-            if date_obj > datetime.now():
-                embed = discord.Embed(
-                    title="❌ Date in the Future",
-                    description="Please select a date that has already occurred.",
-                    color=discord.Color.red(),
-                )
-                await ctx.respond(embed=embed, ephemeral=True)
-                return
+    async def _fetch(self, **params) -> dict | list[dict]:
+        with self.bot.metrics.time_upstream("apod", "http"):
+            async with self.bot.http_session.get(
+                NASA_APOD_URL, params={"api_key": API_KEY, "thumbs": "true", **params}
+            ) as response:
+                response.raise_for_status()
+                return await response.json()
 
-            date = date_obj
+    async def get_entry(self, day: date) -> dict:
+        """Return the APOD entry for a date, from cache where possible"""
+        key = day.isoformat()
+        cached = self._entries.get(key)
+        if cached and (cached[1] is None or cached[1] > time.time()):
+            self._entries.move_to_end(key)
+            return cached[0]
 
-        date = date.strftime("%Y-%m-%d")
+        cached = await self.store.get(key)
+        if cached is None:
+            entry = ingest(await self._fetch(date=key))
+            await self.store.put([entry])
+            cached = entry, expires_at(entry["date"])
+        self._remember(key, *cached)
+        return cached[0]
 
-        async with aiohttp.ClientSession() as session:
-            params = {"api_key": API_KEY, "date": date}
+    async def prefetch(self, start: date, end: date) -> int:
+        """Cache every entry between start and end, returning how many were fetched"""
+        cached = await self.store.cached_dates(start, end)
+        missing = [
+            day
+            for day in (
+                start + timedelta(days=n) for n in range((end - start).days + 1)
+            )
+            if day.isoformat() not in cached
+        ]
 
-            async with session.get(NASA_APOD_URL, params=params) as response:
-                if response.status != 200:
-                    embed = discord.Embed(
-                        title="❌ Error",
-                        description=f"Failed to fetch the Astronomy Picture of the Day: {response.status}",
-                        color=discord.Color.red(),
-                    )
-                    await ctx.respond(embed=embed, ephemeral=True)
-                    log.error(f"APOD API returned status {response.text}")
-                    return
+        fetched = 0
+        while missing:
+            chunk_start = missing[0]
+            chunk_end = min(chunk_start + timedelta(days=PREFETCH_CHUNK_DAYS - 1), end)
+            entries = [
+                ingest(entry)
+                for entry in await self._fetch(
+                    start_date=chunk_start.isoformat(), end_date=chunk_end.isoformat()
+                )
+            ]
+            await self.store.put(entries)
+            fetched += len(entries)
+            log.debug(f"Prefetched {len(entries)} APOD entries from {chunk_start}")
+            missing = [day for day in missing if day > chunk_end]
+        return fetched
 
-                data = await response.json()
+    def validate_date(self, value: str) -> tuple[date | None, discord.Embed | None]:
+        """Parse a user supplied date, returning an error embed if it's invalid"""
+        day = parse_date(value)
+        if day is None:
+            return None, discord.Embed(
+                title="❌ Invalid Date Format",
+                description="Please use MM/DD/YYYY or YYYY-MM-DD format (e.g., 01/15/2024 or 2024-01-15)",
+                color=discord.Color.red(),
+            )
+        if day < FIRST_APOD_DATE:
+            return None, discord.Embed(
+                title="❌ Date Too Early",
+                description="APOD pictures are only available from June 16, 1995 onwards.",
+                color=discord.Color.red(),
+            )
+        if day > publish_today():
+            return None, discord.Embed(
+                title="❌ Date in the Future",
+                description="Please select a date that has already occurred.",
+                color=discord.Color.red(),
+            )
+        return day, None
 
+    def build_embed(self, data: dict) -> discord.Embed:
+        """Build the embed for an APOD entry"""
         title = data.get("title", "Astronomy Picture of the Day")
         explanation = data.get("explanation", "No description available.")
         pic_date = data.get("date", "")
@@ -128,39 +469,208 @@ class APOD(discord.Cog):
             url=url,
         )
 
-        if media_type == "image":
-            embed.set_image(url=url)
-        elif media_type == "video":
-            if "youtube.com" in url or "youtu.be" in url:
-                video_id = extract_youtube_id(url)
-                watch_url = convert_to_youtube_watch_url(url)
-                if video_id:
-                    thumbnail_url = (
-                        f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-                    )
-                    embed.set_image(url=thumbnail_url)
-                    embed.add_field(
-                        name="🎬 YouTube Video",
-                        value=f"[Watch on YouTube]({watch_url})",
-                        inline=False,
-                    )
-                else:
-                    embed.add_field(
-                        name="🎬 YouTube Video",
-                        value=f"[Watch on YouTube]({watch_url})",
-                        inline=False,
-                    )
+        media = data["media"]
+        if media["image_url"]:
+            embed.set_image(url=media["image_url"])
+        if media_type == "video":
+            if media["provider"]:
+                name = VIDEO_PROVIDERS[media["provider"]][0]
+                embed.add_field(
+                    name=f"🎬 {name} Video",
+                    value=f"[Watch on {name}]({media['watch_url']})",
+                    inline=False,
+                )
             else:
                 embed.add_field(
                     name="🎬 Video",
-                    value=f"[Watch Video]({url})",
+                    value=f"[Watch Video]({media['watch_url']})",
                     inline=False,
                 )
 
         embed.set_footer(text=f"📅 {pic_date} | NASA APOD")
 
-        await ctx.respond(embed=embed)
-        log.info(f"APOD fetched for {ctx.author} on {pic_date}: {title}")
+        return embed
+
+    apod = SlashCommandGroup("apod", "NASA Astronomy Picture of the Day")
+
+    @apod.command(name="show")
+    @discord.option(
+        "date",
+        description="Any date after June 16, 1995, in MM/DD/YYYY or YYYY-MM-DD format",
+        required=False,
+    )
+    async def apod_show(self, ctx: discord.ApplicationContext, date: str = None):
+        """Show NASA's Astronomy Picture of the Day"""
+        await ctx.defer()
+
+        if date is None:
+            day = publish_today()
+        else:
+            day, error = self.validate_date(date)
+            if error:
+                await ctx.respond(embed=error, ephemeral=True)
+                return
+
+        try:
+            data = await self.get_entry(day)
+        except aiohttp.ClientResponseError as e:
+            embed = discord.Embed(
+                title="❌ Error",
+                description=f"Failed to fetch the Astronomy Picture of the Day: {e.status}",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            log.error(f"APOD API returned status {e.status}")
+            return
+
+        await ctx.respond(embed=self.build_embed(data))
+        log.info(
+            f"APOD fetched for {ctx.author} on {data.get('date', '')}: {data.get('title')}"
+        )
+
+    @apod.command(name="random")
+    async def apod_random(self, ctx: discord.ApplicationContext):
+        """Show a random Astronomy Picture of the Day from the archive"""
+        row = await self.store.random()
+        if row is None:
+            embed = discord.Embed(
+                title="❌ No Pictures Cached",
+                description="The archive is empty. Browse a date range or ask the bot owner to prefetch one.",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+
+        day, title, media_type, url = row
+        cached = self._entries.get(day.isoformat()) or await self.store.get(
+            day.isoformat()
+        )
+        if cached:
+            data = cached[0]
+        else:
+            # Today's entry past its rollover; the index still has enough
+            # to show it without going upstream
+            data = ingest(
+                {
+                    "date": day.isoformat(),
+                    "title": title,
+                    "media_type": media_type,
+                    "url": url,
+                }
+            )
+
+        await ctx.respond(embed=self.build_embed(data))
+        log.info(f"Random APOD shown to {ctx.author}: {day} {title}")
+
+    @apod.command(name="browse")
+    @discord.option(
+        "start",
+        description="First date to browse, in MM/DD/YYYY or YYYY-MM-DD format",
+        required=False,
+    )
+    @discord.option(
+        "end",
+        description="Last date to browse, defaults to today",
+        required=False,
+    )
+    async def apod_browse(
+        self, ctx: discord.ApplicationContext, start: str = None, end: str = None
+    ):
+        """Browse Astronomy Pictures of the Day in a date range"""
+        await ctx.defer()
+
+        end_day, error = self.validate_date(end) if end else (publish_today(), None)
+        if error is None:
+            start_day, error = (
+                self.validate_date(start)
+                if start
+                else (end_day - timedelta(days=BROWSE_DEFAULT_DAYS - 1), None)
+            )
+        if error:
+            await ctx.respond(embed=error, ephemeral=True)
+            return
+        if end_day < start_day:
+            start_day, end_day = end_day, start_day
+        start_day = max(start_day, FIRST_APOD_DATE)
+        if (end_day - start_day).days >= BROWSE_MAX_DAYS:
+            embed = discord.Embed(
+                title="❌ Range Too Long",
+                description=f"Please browse at most {BROWSE_MAX_DAYS} days at a time.",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+
+        try:
+            # Index whatever part of the range isn't cached in bulk calls, so
+            # page turns are served from the index alone
+            await self.prefetch(start_day, end_day)
+        except aiohttp.ClientResponseError as e:
+            embed = discord.Embed(
+                title="❌ Error",
+                description=f"Failed to fetch the Astronomy Pictures of the Day: {e.status}",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            log.error(f"APOD API returned status {e.status}")
+            return
+
+        view = ApodBrowser(
+            self.store,
+            ctx.author,
+            start_day,
+            end_day,
+            await self.store.index_count(start_day, end_day),
+        )
+        await ctx.respond(embed=await view.render(), view=view)
+        log.info(f"APOD browsed by {ctx.author} from {start_day} to {end_day}")
+
+    @apod.command(name="prefetch")
+    @commands.is_owner()
+    @discord.option(
+        "start",
+        description="First date to cache, in MM/DD/YYYY or YYYY-MM-DD format",
+    )
+    @discord.option(
+        "end",
+        description="Last date to cache, defaults to today",
+        required=False,
+    )
+    async def apod_prefetch(
+        self, ctx: discord.ApplicationContext, start: str, end: str = None
+    ):
+        """Cache a range of APOD entries so lookups need no network"""
+        await ctx.defer(ephemeral=True)
+
+        start_day, error = self.validate_date(start)
+        if error is None:
+            end_day, error = self.validate_date(end) if end else (publish_today(), None)
+        if error:
+            await ctx.respond(embed=error, ephemeral=True)
+            return
+        if end_day < start_day:
+            start_day, end_day = end_day, start_day
+
+        try:
+            fetched = await self.prefetch(start_day, end_day)
+        except aiohttp.ClientResponseError as e:
+            embed = discord.Embed(
+                title="❌ Prefetch Failed",
+                description=f"APOD API returned status {e.status}",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            log.error(f"APOD prefetch failed with status {e.status}")
+            return
+
+        embed = discord.Embed(
+            title="✅ Prefetch Complete",
+            description=f"Fetched {fetched:,} entries from {start_day} to {end_day}",
+            color=discord.Color.green(),
+        )
+        embed.set_footer(text=f"{await self.store.count():,} entries cached")
+        await ctx.respond(embed=embed, ephemeral=True)
+        log.info(f"Prefetched {fetched} APOD entries from {start_day} to {end_day}")
 
 
 def setup(bot: discord.Bot):
@@ -1,11 +1,24 @@
+import asyncio
 import logging
+import time
 
 import aiohttp
 import discord
+from discord.ext import tasks
+
+from hot_keys import HotKeys
 
 log = logging.getLogger(__name__)
 
 COINGECKO_API_URL = "https://api.coingecko.com/api/v3/simple/price"
+# Prices younger than PRICE_TTL are served as is. Older ones are still served
+# for up to PRICE_STALE_TTL while a refresh runs in the background.
+PRICE_TTL = 30
+PRICE_STALE_TTL = 300
+# Currencies asked for within HOT_WINDOW are kept fresh in the background, up
+# to MAX_TRACKED of the most recently used
+HOT_WINDOW = 900
+MAX_TRACKED = 25
 
 
 class Bitcoin(discord.Cog):
@@ -13,6 +26,127 @@ class Bitcoin(discord.Cog):
 
     def __init__(self, bot: discord.Bot):
         self.bot = bot
+        # currency -> (fetched at, price, 24h change); price is None for
+        # currencies CoinGecko doesn't support
+        self._prices: dict[str, tuple[float, float | None, float | None]] = {}
+        # currency -> in-flight fetch that will include it
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Every tracked currency is refreshed with a single vs_currencies call
+        self._requested = HotKeys(HOT_WINDOW, MAX_TRACKED)
+        # Every currency is fetched in one batch, so in a cluster one worker
+        # caches them all and the others ask it
+        bot.cluster.handlers["bitcoin.price"] = self._get_cached_price
+        self.refresh_prices.start()
+
+    def cog_unload(self):
+        self.refresh_prices.cancel()
+        self.bot.cluster.handlers.pop("bitcoin.price", None)
+
+    async def get_price(self, currency: str) -> tuple[float | None, float | None]:
+        """Return the (price, 24h change) of Bitcoin in a currency"""
+        if not currency.isalnum():
+            # Keep malformed input out of the shared vs_currencies batch
+            return None, None
+
+        owner = self.bot.cluster.owner("bitcoin")
+        if owner != self.bot.cluster.worker_id:
+            try:
+                with self.bot.metrics.time_upstream("bitcoin", "cluster"):
+                    return tuple(
+                        await self.bot.cluster.call(
+                            owner, "bitcoin.price", currency=currency
+                        )
+                    )
+            except aiohttp.ClientError as e:
+                log.warning(f"Worker {owner} unreachable, fetching {currency}: {e}")
+        return await self._get_cached_price(currency)
+
+    async def _get_cached_price(
+        self, currency: str
+    ) -> tuple[float | None, float | None]:
+        now = time.monotonic()
+        self._requested.touch(currency, now)
+
+        cached = self._prices.get(currency)
+        if cached:
+            age = now - cached[0]
+            if age < PRICE_TTL:
+                return cached[1:]
+            if age < PRICE_STALE_TTL:
+                self._refresh(currency)
+                return cached[1:]
+
+        # Shielded so one cancelled request doesn't cancel the shared fetch
+        await asyncio.shield(self._refresh(currency))
+        return self._prices[currency][1:]
+
+    def _refresh(self, currency: str) -> asyncio.Task:
+        """Return the in-flight fetch for a currency, starting one if needed"""
+        task = self._inflight.get(currency)
+        if task is not None:
+            return task
+
+        now = time.monotonic()
+        self._prices = {
+            c: cached
+            for c, cached in self._prices.items()
+            if now - cached[0] < PRICE_STALE_TTL
+        }
+        currencies = {currency} | {
+            c for c in self._requested if c not in self._inflight
+        }
+        task = asyncio.create_task(self._fetch_prices(currencies))
+        task.add_done_callback(self._fetch_done)
+        for c in currencies:
+            self._inflight[c] = task
+        return task
+
+    def _fetch_done(self, task: asyncio.Task):
+        for currency in [c for c, t in self._inflight.items() if t is task]:
+            del self._inflight[currency]
+        if not task.cancelled() and task.exception():
+            log.error(f"Error refreshing Bitcoin prices: {task.exception()}")
+
+    async def _fetch_prices(self, currencies: set[str]):
+        params = {
+            "ids": "bitcoin",
+            "vs_currencies": ",".join(sorted(currencies)),
+            "include_24hr_change": "true",
+        }
+
+        with self.bot.metrics.time_upstream("bitcoin", "coingecko"):
+            async with self.bot.http_session.get(
+                COINGECKO_API_URL, params=params
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+
+        bitcoin_data = data.get("bitcoin", {})
+        fetched_at = time.monotonic()
+        for currency in currencies:
+            self._prices[currency] = (
+                fetched_at,
+                bitcoin_data.get(currency),
+                bitcoin_data.get(f"{currency}_24h_change"),
+            )
+        log.debug(f"Fetched Bitcoin prices for {', '.join(sorted(currencies))}")
+
+    @tasks.loop(seconds=PRICE_TTL * 2 / 3)
+    async def refresh_prices(self):
+        """Keep recently requested currencies fresh so /bitcoin answers from cache"""
+        hot = self._requested.hot(time.monotonic())
+        if not hot:
+            return
+        try:
+            # A single fetch covers every tracked currency
+            await self._refresh(hot[-1])
+        except Exception:
+            # Already logged by _fetch_done; try again next iteration
+            pass
+
+    @refresh_prices.before_loop
+    async def before_refresh_prices(self):
+        await self.bot.wait_until_ready()
 
     @discord.slash_command(name="bitcoin")
     @discord.option(
@@ -25,29 +159,17 @@ class Bitcoin(discord.Cog):
         await ctx.defer()
 
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "ids": "bitcoin",
-                    "vs_currencies": currency.lower(),
-                    "include_24hr_change": "true",
-                }
-
-                async with session.get(COINGECKO_API_URL, params=params) as response:
-                    if response.status != 200:
-                        embed = discord.Embed(
-                            title="❌ Error",
-                            description=f"Failed to fetch Bitcoin price: {response.status}",
-                            color=discord.Color.red(),
-                        )
-                        await ctx.respond(embed=embed, ephemeral=True)
-                        log.error(f"CoinGecko API returned status {response.status}")
-                        return
-
-                    data = await response.json()
-
-            bitcoin_data = data.get("bitcoin", {})
-            currency_lower = currency.lower()
-            price = bitcoin_data.get(currency_lower)
+            try:
+                price, change_24h = await self.get_price(currency.lower())
+            except aiohttp.ClientResponseError as e:
+                embed = discord.Embed(
+                    title="❌ Error",
+                    description=f"Failed to fetch Bitcoin price: {e.status}",
+                    color=discord.Color.red(),
+                )
+                await ctx.respond(embed=embed, ephemeral=True)
+                log.error(f"CoinGecko API returned status {e.status}")
+                return
 
             if price is None:
                 embed = discord.Embed(
@@ -59,8 +181,6 @@ class Bitcoin(discord.Cog):
                 log.warning(f"Invalid currency requested: {currency}")
                 return
 
-            change_24h = bitcoin_data.get(f"{currency_lower}_24h_change")
-
             embed = discord.Embed(
                 title="₿ Bitcoin Price",
                 color=discord.Color.orange(),
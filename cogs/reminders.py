@@ -1,17 +1,70 @@
+import asyncio
 import calendar
+import heapq
+import json
 import logging
+import os
+import random
 import re
 import sqlite3
+import statistics
+import time
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime, timedelta
-from pathlib import Path
+from functools import lru_cache
 
 import discord
 from discord.commands import SlashCommandGroup
-from discord.ext import tasks
+from discord.ext import commands, tasks
+
+from sqlite_store import DATA_DIR, SqliteStore
 
 log = logging.getLogger(__name__)
 
-DB_PATH = Path(__file__).parent.parent / "reminders.db"
+DB_PATH = DATA_DIR / "reminders.db"
+# Sent reminders older than this are purged by the retention job
+RETENTION_DAYS = int(os.environ.get("BROBOT_REMINDERS_RETENTION_DAYS", 30))
+RETENTION_BATCH_SIZE = 500
+# Channels sent to at once when a burst of reminders comes due. Reminders for
+# the same channel are sent one after another to stay within its rate limit.
+DISPATCH_CONCURRENCY = 10
+# Failed deliveries are retried with exponential backoff and dead-lettered
+# after MAX_DELIVERY_ATTEMPTS
+MAX_DELIVERY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 15
+# /reminders dead shortens each reminder's text and error to this many
+# characters, and stops adding reminders before Discord's 6000 character
+# embed limit
+DEAD_PREVIEW_CHARS = 150
+DEAD_EMBED_CHARS = 5800
+
+# Delivery states. A reminder is pending until it comes due, in_flight while
+# it is being sent, and then delivered, retrying (until its retry_at time) or
+# dead once its attempts are exhausted or the failure is permanent.
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DELIVERED = "delivered"
+RETRYING = "retrying"
+DEAD = "dead"
+
+# Autocomplete previews for the `when` option, cached briefly per user and
+# input since relative times drift as the clock moves
+WHEN_PREVIEW_TTL = 5
+WHEN_PREVIEW_CACHE_SIZE = 2048
+WHEN_EXAMPLES = (
+    "in 10 minutes",
+    "in 1 hour",
+    "2h30m",
+    "tomorrow",
+    "next week",
+    "monday 09:00",
+    "friday 17:00",
+    "in 2 weeks",
+    "in a month",
+    "every monday 09:00",
+    "daily at 08:00",
+)
+WHEN_UNIT_SUFFIXES = (" minutes", " hours", " days", " weeks", " months")
 
 
 def _add_months(dt: datetime, months: int) -> datetime:
@@ -23,6 +76,174 @@ def _add_months(dt: datetime, months: int) -> datetime:
     return dt.replace(year=year, month=month, day=day)
 
 
+# Time expression grammar, compiled once. parse_when_to_datetime normalizes its
+# input, dispatches on its shape to one of these patterns and caches the
+# resulting expression, which is then resolved against the current time.
+_DATE_RE = re.compile(
+    r"^(?:(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})"
+    r"|(?P<us_m>\d{1,2})/(?P<us_d>\d{1,2})(?:/(?P<us_y>\d{4}))?)"
+    # strptime's %M, which the original parser used, takes one or two digits
+    r"(?:\s+(?P<hour>\d{1,2}):(?P<minute>\d{1,2}))?$"
+)
+_RELATIVE_RE = re.compile(
+    r"^(?:(?P<article>an?)|(?P<num>\d+))\s*"
+    r"(?:(?P<years>years?|yrs?)|(?P<months>months?)|(?P<weeks>weeks?)"
+    r"|(?P<days>days?)|(?P<hours>hours?|hrs?)|(?P<minutes>minutes?|mins?|m)"
+    r"|(?P<seconds>seconds?|secs?|s))$"
+)
+_COMPACT_RE = re.compile(r"^(?:(\d+)h(?:ours?)?(?:\s*(\d+)m?)?|(\d+)m)$")
+_WEEKDAYS = [d.lower() for d in calendar.day_name]
+_WEEKDAY_RE = re.compile(
+    r"^(?:next\s+)?(" + "|".join(_WEEKDAYS) + r")(?:\s+(\d{1,2}):(\d{2}))?$"
+)
+_KEYWORDS = ("now", "today", "tomorrow", "next week")
+_UNIT_SECONDS = {
+    "weeks": 604800,
+    "days": 86400,
+    "hours": 3600,
+    "minutes": 60,
+    "seconds": 1,
+}
+
+
+@lru_cache(maxsize=1024)
+def _parse_expression(s: str) -> tuple | None:
+    """Parse a normalized time expression, independent of the current time.
+
+    Returns one of:
+    - ("keyword", name)
+    - ("delta", seconds)
+    - ("months", n) or ("years", n)
+    - ("date", year or None, month, day, hour or None, minute or None)
+    - ("weekday", weekday, hour or None, minute or None, skip_today)
+    or None if the expression isn't understood.
+    """
+    if not s:
+        return None
+    if s in _KEYWORDS:
+        return ("keyword", s)
+
+    if s[0].isdigit() and ("-" in s or "/" in s):
+        m = _DATE_RE.match(s)
+        if not m:
+            return None
+        hour = int(m["hour"]) if m["hour"] else None
+        minute = int(m["minute"]) if m["minute"] else None
+        if m["iso_y"]:
+            return (
+                "date",
+                int(m["iso_y"]),
+                int(m["iso_m"]),
+                int(m["iso_d"]),
+                hour,
+                minute,
+            )
+        year = int(m["us_y"]) if m["us_y"] else None
+        return ("date", year, int(m["us_m"]), int(m["us_d"]), hour, minute)
+
+    if s.startswith("in "):
+        s = s[3:].lstrip()
+    elif s.startswith("next "):
+        m = _WEEKDAY_RE.match(s)
+        if not m:
+            return None
+        return _weekday_expression(m, skip_today=True)
+
+    if s[0].isdigit() or s[0] == "a":
+        m = _RELATIVE_RE.match(s)
+        if m:
+            num = 1 if m["article"] else int(m["num"])
+            unit = m.lastgroup
+            if unit in ("years", "months"):
+                return (unit, num)
+            return ("delta", num * _UNIT_SECONDS[unit])
+
+        m = _COMPACT_RE.match(s)
+        if m:
+            hours = int(m[1] or 0)
+            minutes = int(m[2] or m[3] or 0)
+            return ("delta", hours * 3600 + minutes * 60)
+        return None
+
+    m = _WEEKDAY_RE.match(s)
+    if m:
+        # A bare weekday means the next one, but with a time it can be today
+        return _weekday_expression(m, skip_today=not m[2])
+    return None
+
+
+def _weekday_expression(m: re.Match, skip_today: bool) -> tuple:
+    hour = int(m[2]) if m[2] else None
+    minute = int(m[3]) if m[3] else None
+    return ("weekday", _WEEKDAYS.index(m[1]), hour, minute, skip_today)
+
+
+def _resolve_expression(expr: tuple, now: datetime) -> datetime | None:
+    """Resolve a parsed time expression against now
+
+    Returns None if the expression names an impossible date or time, such as
+    02/30 or 25:00.
+    """
+    kind = expr[0]
+
+    if kind == "delta":
+        return now + timedelta(seconds=expr[1])
+
+    if kind == "months":
+        return _add_months(now, expr[1])
+
+    if kind == "years":
+        try:
+            return now.replace(year=now.year + expr[1])
+        except ValueError:
+            # Feb 29 handling
+            return now.replace(year=now.year + expr[1], day=now.day - 1)
+
+    if kind == "keyword":
+        if expr[1] in ("now", "today"):
+            return now
+        days = 1 if expr[1] == "tomorrow" else 7
+        return (now + timedelta(days=days)).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        )
+
+    if kind == "weekday":
+        _, target_wd, hour, minute, skip_today = expr
+        days_ahead = (target_wd - now.weekday()) % 7
+        if hour is None:
+            hour, minute = 9, 0
+        try:
+            target = (now + timedelta(days=days_ahead)).replace(
+                hour=hour, minute=minute, second=0, microsecond=0
+            )
+        except ValueError:
+            return None
+        # Today only counts if the time is still ahead of us
+        if days_ahead == 0 and (skip_today or target <= now):
+            target += timedelta(days=7)
+        return target
+
+    # Explicit dates. If no time is given, default to 09:00, and if the date
+    # has already passed this year, bump it to the next one.
+    _, year, month, day, hour, minute = expr
+    date_only = hour is None
+    if date_only:
+        hour, minute = 9, 0
+    try:
+        dt = datetime(year or now.year, month, day, hour, minute)
+    except ValueError:
+        return None
+    if dt < now and date_only:
+        try:
+            dt = dt.replace(year=dt.year + 1)
+        except ValueError:
+            pass
+    if dt < now:
+        # For explicit datetimes, only accept future
+        raise ValueError("Please specify a future date and time.")
+    return dt
+
+
 def parse_when_to_datetime(when: str) -> datetime:
     """Parse a flexible time description into a future datetime.
 
@@ -33,142 +254,783 @@ def parse_when_to_datetime(when: str) -> datetime:
     - Natural: "in a month", "in 1 year", "tomorrow", "today", "next week"
     - Weekday names: "monday", optionally with HH:MM
     """
-    s = when.strip().lower()
-    s = re.sub(r",", "", s)
+    expr = _parse_expression(_normalize_when(when))
+    dt = _resolve_expression(expr, datetime.now()) if expr else None
+    if dt is not None:
+        return dt
+
+    raise ValueError(
+        "Could not understand time. Examples: '2026-01-05 14:30', '12/3', 'in 2 weeks', '2h30m', 'monday 14:00'"
+    )
+
+
+_RECURRENCE_ALIASES = {
+    "hourly": "every hour",
+    "daily": "every day",
+    "weekly": "every week",
+    "monthly": "every month",
+    "yearly": "every year",
+}
+_RECURRENCE_TIME_RE = re.compile(r"^(.*?)(?:\s+at)?\s+(\d{1,2}):(\d{2})$")
+_RECURRENCE_MONTHDAY_RE = re.compile(
+    r"^(?:(\d+)\s+)?months?\s+on\s+the\s+(\d{1,2})(?:st|nd|rd|th)?$"
+)
+# Shortest interval a recurring reminder may repeat at
+MIN_RECURRENCE_SECONDS = 60
+
+
+def _normalize_when(when: str) -> str:
+    return " ".join(when.lower().replace(",", "").split())
+
+
+@lru_cache(maxsize=256)
+def _parse_recurrence_rule(rule: str) -> tuple | None:
+    """Parse a normalized recurrence rule such as "every monday 09:00".
+
+    Returns one of:
+    - ("interval", seconds, hour or None, minute or None)
+    - ("weekday", weekday, hour or None, minute or None)
+    - ("monthly", months, day or None, hour or None, minute or None)
+    or None if the rule isn't understood.
+    """
+    first, _, rest = rule.partition(" ")
+    if first in _RECURRENCE_ALIASES:
+        rule = f"{_RECURRENCE_ALIASES[first]} {rest}".strip()
+    if not rule.startswith("every "):
+        return None
+    rest = rule[len("every ") :]
+
+    hour = minute = None
+    m = _RECURRENCE_TIME_RE.match(rest)
+    if m:
+        rest, hour, minute = m[1], int(m[2]), int(m[3])
+        if hour > 23 or minute > 59:
+            return None
+
+    if rest in _WEEKDAYS:
+        return ("weekday", _WEEKDAYS.index(rest), hour, minute)
+
+    m = _RECURRENCE_MONTHDAY_RE.match(rest)
+    if m:
+        day = int(m[2])
+        if not 1 <= day <= 31:
+            return None
+        return ("monthly", int(m[1] or 1), day, hour, minute)
+
+    # "every day", "every 2h" and "every 3 weeks" reuse the relative grammar
+    expr = _parse_expression(rest if rest[:1].isdigit() else f"1 {rest}")
+    if expr is None:
+        return None
+    kind, amount = expr[:2]
+    if kind == "months":
+        return ("monthly", amount, None, hour, minute)
+    if kind == "years":
+        return ("monthly", amount * 12, None, hour, minute)
+    if kind != "delta" or amount < MIN_RECURRENCE_SECONDS:
+        return None
+    if hour is not None and amount % 86400:
+        # A time of day only makes sense for whole-day intervals
+        return None
+    return ("interval", amount, hour, minute)
+
+
+def next_occurrence(rule: str, after: datetime) -> datetime:
+    """Return the first occurrence of a recurrence rule after the given time"""
+    spec = _parse_recurrence_rule(rule)
+    if spec is None:
+        raise ValueError(f"Invalid recurrence: {rule}")
+    kind = spec[0]
+
+    if kind == "weekday":
+        return _resolve_expression((*spec, False), after)
+
+    if kind == "interval":
+        _, seconds, hour, minute = spec
+        if hour is None:
+            return after + timedelta(seconds=seconds)
+        candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if candidate <= after:
+            candidate += timedelta(seconds=seconds)
+        return candidate
+
+    _, months, day, hour, minute = spec
+    if day is None and hour is None:
+        return _add_months(after, months)
+    day = day or after.day
+    if hour is None:
+        hour, minute = 9, 0
+
+    def on_day(dt: datetime) -> datetime:
+        last_day = calendar.monthrange(dt.year, dt.month)[1]
+        return dt.replace(
+            day=min(day, last_day), hour=hour, minute=minute, second=0, microsecond=0
+        )
+
+    candidate = on_day(after)
+    if candidate <= after:
+        candidate = on_day(_add_months(after.replace(day=1), months))
+    return candidate
+
+
+def _ordinal(n: int) -> str:
+    suffix = (
+        "th" if 11 <= n % 100 <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    )
+    return f"{n}{suffix}"
+
+
+def parse_recurrence(when: str) -> tuple[str, datetime] | None:
+    """Parse a recurring time description into its rule and first occurrence.
+
+    Supports "every monday 09:00", "every 2h", "every 3 days", "daily at 08:00",
+    "weekly", "monthly on the 1st" and "every 2 months on the 15th 10:00".
+    Returns None if the description isn't recurring.
+
+    Monthly and yearly rules without a day are pinned to today's day of the
+    month, so "monthly" made on the 31st returns to the 31st after February
+    instead of drifting to the 28th.
+    """
+    rule = _normalize_when(when)
+    if rule.split(" ", 1)[0] not in ("every", *_RECURRENCE_ALIASES):
+        return None
+    spec = _parse_recurrence_rule(rule)
+    if spec is None:
+        raise ValueError(
+            "Could not understand recurrence. Examples: 'every monday 09:00', 'every 2h', 'daily at 08:00', 'monthly on the 1st'"
+        )
     now = datetime.now()
+    if spec[0] == "monthly" and spec[2] is None:
+        _, months, _, hour, minute = spec
+        if hour is None:
+            hour, minute = now.hour, now.minute
+        every = "every month" if months == 1 else f"every {months} months"
+        rule = f"{every} on the {_ordinal(now.day)} {hour:02d}:{minute:02d}"
+    return rule, next_occurrence(rule, now)
 
-    # Try ISO and common explicit formats
-    explicit_formats = [
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d",
-        "%m/%d/%Y %H:%M",
-        "%m/%d/%Y",
-        "%m/%d %H:%M",
-        "%m/%d",
-    ]
-    for fmt in explicit_formats:
-        try:
-            dt = datetime.strptime(s, fmt)
-            # If format lacked year, fill with current year
-            if fmt in ("%m/%d", "%m/%d %H:%M") and dt.year == 1900:
-                dt = dt.replace(year=now.year)
-            # If no time provided, default to 09:00
-            if fmt in ("%Y-%m-%d", "%m/%d", "%m/%d/%Y"):
-                dt = dt.replace(hour=9, minute=0)
-            # If date-only and already passed, bump year
-            if dt < now and fmt in ("%m/%d", "%m/%d/%Y", "%Y-%m-%d"):
-                try:
-                    dt = dt.replace(year=dt.year + 1)
-                except Exception:
-                    pass
-            if dt < now:
-                # For explicit datetimes, only accept future
-                raise ValueError("Please specify a future date and time.")
-            return dt
-        except ValueError:
-            continue
 
-    # Natural keywords
-    if s in ("now", "today"):
-        return now
-    if s == "tomorrow":
-        return (now + timedelta(days=1)).replace(
-            hour=9, minute=0, second=0, microsecond=0
+def _shorten(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _create_reminders_table(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL,
+            reminder_text TEXT NOT NULL,
+            reminder_time TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            sent INTEGER DEFAULT 0
         )
-    if s == "next week":
-        return (now + timedelta(weeks=1)).replace(
-            hour=9, minute=0, second=0, microsecond=0
+    """
+    )
+
+
+def _store_times_as_epoch(conn: sqlite3.Connection):
+    """Rebuild the table with reminder_time and created_at as epoch seconds"""
+    conn.execute(
+        """
+        CREATE TABLE reminders_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL,
+            reminder_text TEXT NOT NULL,
+            reminder_time INTEGER NOT NULL,
+            created_at INTEGER NOT NULL,
+            sent INTEGER DEFAULT 0
         )
+    """
+    )
+    rows = conn.execute(
+        "SELECT id, user_id, channel_id, reminder_text, reminder_time, created_at, sent FROM reminders"
+    )
+    conn.executemany(
+        "INSERT INTO reminders_new VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                *row[:4],
+                int(datetime.fromisoformat(row[4]).timestamp()),
+                int(datetime.fromisoformat(row[5]).timestamp()),
+                row[6],
+            )
+            for row in rows.fetchall()
+        ),
+    )
+    conn.execute("DROP TABLE reminders")
+    conn.execute("ALTER TABLE reminders_new RENAME TO reminders")
+
 
-    # Relative durations like 'in 2 weeks', '3 days', '30 minutes', 'in a month', '10 seconds'
-    m = re.match(
-        r"^(?:in\s+)?(?:(a|an)|([0-9]+))\s*(years?|yrs?|months?|weeks?|days?|hours?|hrs?|minutes?|mins?|m|seconds?|secs?|s)$",
-        s,
+def _add_reminder_indexes(conn: sqlite3.Connection):
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_pending_time ON reminders (reminder_time) WHERE sent = 0"
     )
-    if m:
-        num = 1 if m.group(1) else int(m.group(2))
-        unit = m.group(3)
-        if unit.startswith("year") or unit.startswith("yr"):
-            try:
-                return now.replace(year=now.year + num)
-            except Exception:
-                # Feb 29 handling
-                return now.replace(year=now.year + num, day=now.day - 1)
-        if unit.startswith("month"):
-            return _add_months(now, num)
-        if unit.startswith("week"):
-            return now + timedelta(weeks=num)
-        if unit.startswith("day"):
-            return now + timedelta(days=num)
-        if unit.startswith("hour"):
-            return now + timedelta(hours=num)
-        if unit.startswith("min") or unit == "m":
-            return now + timedelta(minutes=num)
-        if unit.startswith("sec") or unit == "s":
-            return now + timedelta(seconds=num)
-
-    # Compact hour/min like '2h30m', '4h15', '2h', '30m'
-    m = re.match(r"^(?:in\s+)?(?:(\d+)h(?:ours?)?)?(?:(\d+)m)?$", s)
-    if m and (m.group(1) or m.group(2)):
-        hours = int(m.group(1)) if m.group(1) else 0
-        mins = int(m.group(2)) if m.group(2) else 0
-        return now + timedelta(hours=hours, minutes=mins)
-
-    # Weekday names optionally with time 'monday' or 'monday 14:30'
-    days = [d.lower() for d in calendar.day_name]
-    wd_match = re.match(
-        r"^(?:next\s+)?(" + "|".join(days) + r")(?:\s+(\d{1,2}:\d{2}))?$", s
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_user ON reminders (user_id, sent, reminder_time)"
     )
-    if wd_match:
-        name = wd_match.group(1)
-        timepart = wd_match.group(2)
-        target_wd = days.index(name)
-        days_ahead = (target_wd - now.weekday() + 7) % 7
-        if days_ahead == 0:
-            days_ahead = 7
-        target = now + timedelta(days=days_ahead)
-        if timepart:
-            hh, mm = map(int, timepart.split(":"))
-            target = target.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        else:
-            target = target.replace(hour=9, minute=0, second=0, microsecond=0)
-        return target
 
-    raise ValueError(
-        "Could not understand time. Examples: '2026-01-05 14:30', '12/3', 'in 2 weeks', '2h30m', 'monday 14:00'"
+
+def _add_delivery_state(conn: sqlite3.Connection):
+    """Replace the sent flag with a delivery state and retry bookkeeping"""
+    conn.execute(
+        "ALTER TABLE reminders ADD COLUMN state TEXT NOT NULL DEFAULT 'pending'"
+    )
+    conn.execute("ALTER TABLE reminders ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE reminders ADD COLUMN retry_at INTEGER")
+    conn.execute("ALTER TABLE reminders ADD COLUMN last_error TEXT")
+    conn.execute("UPDATE reminders SET state = 'delivered' WHERE sent = 1")
+    conn.execute("DROP INDEX IF EXISTS idx_reminders_pending_time")
+    conn.execute("DROP INDEX IF EXISTS idx_reminders_user")
+    conn.execute("ALTER TABLE reminders DROP COLUMN sent")
+    conn.execute(
+        "CREATE INDEX idx_reminders_pending_time ON reminders (reminder_time) WHERE state != 'delivered' AND state != 'dead'"
+    )
+    conn.execute(
+        "CREATE INDEX idx_reminders_user ON reminders (user_id, state, reminder_time)"
+    )
+    conn.execute("CREATE INDEX idx_reminders_state ON reminders (state)")
+
+
+def _add_recurrence(conn: sqlite3.Connection):
+    """Add the recurrence rule of recurring reminders"""
+    conn.execute("ALTER TABLE reminders ADD COLUMN recurrence TEXT")
+
+
+def _add_guild_id(conn: sqlite3.Connection):
+    """Add the guild a reminder was created in, NULL for DMs
+
+    Reminders created before this migration are treated as DMs, so they are
+    delivered by the worker running shard 0.
+    """
+    conn.execute("ALTER TABLE reminders ADD COLUMN guild_id INTEGER")
+
+
+def _index_state_time(conn: sqlite3.Connection):
+    """Index reminders by state and time for the load, dead list and purge
+
+    No query matched the partial index's state != predicate, and the state
+    index couldn't serve the purge's time range.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_reminders_pending_time")
+    conn.execute("DROP INDEX IF EXISTS idx_reminders_state")
+    conn.execute(
+        "CREATE INDEX idx_reminders_state_time ON reminders (state, reminder_time)"
     )
 
 
+# Schema migrations, applied in order. The number of migrations already
+# applied is tracked in the database's user_version pragma, so new migrations
+# must only ever be appended.
+MIGRATIONS = [
+    _create_reminders_table,
+    _store_times_as_epoch,
+    _add_reminder_indexes,
+    _add_delivery_state,
+    _add_recurrence,
+    _add_guild_id,
+    _index_state_time,
+]
+
+
+class ReminderStore(SqliteStore):
+    """Reminders persistence on a dedicated database thread"""
+
+    name = "reminders"
+    migrations = MIGRATIONS
+
+    def configure(self, conn: sqlite3.Connection):
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # Switching an existing database to incremental vacuum only
+            # takes effect after a full VACUUM
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+
+    def _create(
+        self,
+        user_id: int,
+        channel_id: int,
+        text: str,
+        reminder_dt: datetime,
+        recurrence: str | None,
+        guild_id: int | None,
+    ) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                INSERT INTO reminders (user_id, channel_id, reminder_text, reminder_time, created_at, recurrence, guild_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    user_id,
+                    channel_id,
+                    text,
+                    int(reminder_dt.timestamp()),
+                    int(datetime.now().timestamp()),
+                    recurrence,
+                    guild_id,
+                ),
+            )
+        return cursor.lastrowid
+
+    def _list(self, user_id: int) -> list[tuple[int, str, datetime, str | None]]:
+        rows = self.conn.execute(
+            """
+            SELECT id, reminder_text, reminder_time, recurrence FROM reminders
+            WHERE user_id = ? AND state IN ('pending', 'in_flight', 'retrying')
+            ORDER BY reminder_time ASC
+        """,
+            (user_id,),
+        ).fetchall()
+        return [
+            (rid, text, datetime.fromtimestamp(t), rule) for rid, text, t, rule in rows
+        ]
+
+    def _pending(
+        self, shard_count: int | None, shard_ids: list[int] | None
+    ) -> list[tuple]:
+        # Reminders left in_flight by a crash are retried, since we can't
+        # know whether their send went out. Once analyzed, sqlite assumes
+        # each state holds a third of the table and would rather scan it.
+        query = """
+            SELECT id, user_id, channel_id, reminder_text, reminder_time, recurrence, attempts, retry_at
+            FROM reminders INDEXED BY idx_reminders_state_time
+            WHERE state IN ('pending', 'in_flight', 'retrying')
+        """
+        params = ()
+        if shard_count is not None:
+            # The shard of a guild is (guild_id >> 22) % shard_count, and DMs
+            # are received by shard 0
+            query += """
+                AND (COALESCE(guild_id, 0) >> 22) % ?
+                    IN (SELECT value FROM json_each(?))
+            """
+            params = (shard_count, json.dumps(shard_ids))
+        rows = self.conn.execute(query, params).fetchall()
+        return [
+            (
+                *row[:4],
+                datetime.fromtimestamp(row[4]),
+                *row[5:7],
+                datetime.fromtimestamp(row[7]) if row[7] is not None else None,
+            )
+            for row in rows
+        ]
+
+    def _dead(self) -> list[tuple]:
+        return self.conn.execute(
+            """
+            SELECT id, user_id, reminder_text, reminder_time, attempts, last_error
+            FROM reminders WHERE state = 'dead'
+            ORDER BY reminder_time ASC
+        """
+        ).fetchall()
+
+    def _owner(self, reminder_id: int) -> int | None:
+        row = self.conn.execute(
+            "SELECT user_id FROM reminders WHERE id = ?", (reminder_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _dead_guild(self, reminder_id: int) -> tuple[int | None] | None:
+        return self.conn.execute(
+            "SELECT guild_id FROM reminders WHERE id = ? AND state = 'dead'",
+            (reminder_id,),
+        ).fetchone()
+
+    def _delete(self, reminder_id: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+
+    def _claim_due(self, reminder_ids: list[int]) -> set[int]:
+        ids = json.dumps(reminder_ids)
+        with self.conn:
+            rows = self.conn.execute(
+                """
+                SELECT id FROM reminders
+                WHERE state IN ('pending', 'in_flight', 'retrying')
+                AND id IN (SELECT value FROM json_each(?))
+            """,
+                (ids,),
+            ).fetchall()
+            self.conn.execute(
+                "UPDATE reminders SET state = 'in_flight' WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps([row[0] for row in rows]),),
+            )
+        return {row[0] for row in rows}
+
+    def _mark_delivered(self, reminder_ids: list[int]):
+        with self.conn:
+            self.conn.execute(
+                """
+                UPDATE reminders SET state = 'delivered', retry_at = NULL
+                WHERE id IN (SELECT value FROM json_each(?))
+            """,
+                (json.dumps(reminder_ids),),
+            )
+
+    def _mark_failed(self, failures: list[tuple[int, str, int, int | None, str]]):
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE reminders SET state = ?, attempts = ?, retry_at = ?, last_error = ? WHERE id = ?",
+                (
+                    (state, attempts, retry_at, error, reminder_id)
+                    for reminder_id, state, attempts, retry_at, error in failures
+                ),
+            )
+
+    def _materialize_next(self, occurrences: list[tuple[int, datetime]]) -> list[int]:
+        new_ids = []
+        with self.conn:
+            for reminder_id, next_dt in occurrences:
+                cursor = self.conn.execute(
+                    """
+                    INSERT INTO reminders (user_id, channel_id, reminder_text, reminder_time, created_at, recurrence, guild_id)
+                    SELECT user_id, channel_id, reminder_text, ?, ?, recurrence, guild_id
+                    FROM reminders WHERE id = ?
+                """,
+                    (
+                        int(next_dt.timestamp()),
+                        int(datetime.now().timestamp()),
+                        reminder_id,
+                    ),
+                )
+                new_ids.append(cursor.lastrowid)
+                # The fired occurrence is now a one-shot reminder, so
+                # replaying it can't fork the series
+                self.conn.execute(
+                    "UPDATE reminders SET recurrence = NULL WHERE id = ?",
+                    (reminder_id,),
+                )
+        return new_ids
+
+    def _replay(self, reminder_id: int) -> tuple | None:
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                UPDATE reminders SET state = 'pending', attempts = 0, retry_at = NULL, last_error = NULL
+                WHERE id = ? AND state = 'dead'
+            """,
+                (reminder_id,),
+            )
+        if not cursor.rowcount:
+            return None
+        row = self.conn.execute(
+            "SELECT user_id, channel_id, reminder_text, reminder_time FROM reminders WHERE id = ?",
+            (reminder_id,),
+        ).fetchone()
+        return (*row[:3], datetime.fromtimestamp(row[3]))
+
+    def _stats(self) -> dict:
+        states = dict(
+            self.conn.execute(
+                "SELECT state, COUNT(*) FROM reminders GROUP BY state"
+            ).fetchall()
+        )
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return {
+            "rows": sum(states.values()),
+            "states": states,
+            "db_bytes": page_count * page_size,
+            "free_bytes": free_pages * page_size,
+        }
+
+    def _purge_sent_batch(self, cutoff: int, limit: int) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                DELETE FROM reminders WHERE id IN (
+                    SELECT id FROM reminders
+                    WHERE state = 'delivered' AND reminder_time < ?
+                    LIMIT ?
+                )
+            """,
+                (cutoff, limit),
+            )
+        return cursor.rowcount
+
+    def _compact(self):
+        # incremental_vacuum frees one page per step; executescript steps it
+        # to completion where execute would stop after the first page
+        self.conn.executescript("PRAGMA incremental_vacuum")
+        self.conn.execute("PRAGMA optimize")
+
+    async def create(
+        self,
+        user_id: int,
+        channel_id: int,
+        text: str,
+        reminder_dt: datetime,
+        recurrence: str | None = None,
+        guild_id: int | None = None,
+    ) -> int:
+        """Insert a reminder and return its id"""
+        return await self._run(
+            self._create, user_id, channel_id, text, reminder_dt, recurrence, guild_id
+        )
+
+    async def list_for_user(
+        self, user_id: int
+    ) -> list[tuple[int, str, datetime, str | None]]:
+        """Return a user's unsent reminders, soonest first"""
+        return await self._run(self._list, user_id)
+
+    async def pending(
+        self, shard_count: int | None = None, shard_ids: list[int] | None = None
+    ) -> list[tuple]:
+        """Return every reminder still to be delivered, with its retry state
+
+        Given a shard count, only reminders from guilds on shard_ids are
+        returned.
+        """
+        return await self._run(self._pending, shard_count, shard_ids)
+
+    async def dead(self) -> list[tuple]:
+        """Return every dead-lettered reminder"""
+        return await self._run(self._dead)
+
+    async def owner(self, reminder_id: int) -> int | None:
+        """Return the user id that owns a reminder, or None if it doesn't exist"""
+        return await self._run(self._owner, reminder_id)
+
+    async def dead_guild(self, reminder_id: int) -> tuple[int | None] | None:
+        """Return (guild_id,) of a dead reminder, or None if it isn't dead"""
+        return await self._run(self._dead_guild, reminder_id)
+
+    async def delete(self, reminder_id: int):
+        """Delete a reminder"""
+        await self._run(self._delete, reminder_id)
+
+    async def claim_due(self, reminder_ids: list[int]) -> set[int]:
+        """Mark due reminders in_flight, returning the ids that were claimed"""
+        return await self._run(self._claim_due, reminder_ids)
+
+    async def mark_delivered(self, reminder_ids: list[int]):
+        """Mark reminders as delivered in a single transaction"""
+        await self._run(self._mark_delivered, reminder_ids)
+
+    async def mark_failed(self, failures: list[tuple[int, str, int, int | None, str]]):
+        """Record failed deliveries as (id, state, attempts, retry_at, error)"""
+        await self._run(self._mark_failed, failures)
+
+    async def materialize_next(
+        self, occurrences: list[tuple[int, datetime]]
+    ) -> list[int]:
+        """Store the next occurrence of each fired recurring reminder
+
+        Takes (fired id, next occurrence) pairs and returns the new ids.
+        """
+        return await self._run(self._materialize_next, occurrences)
+
+    async def replay(self, reminder_id: int) -> tuple | None:
+        """Move a dead reminder back to pending, returning it if it was dead"""
+        return await self._run(self._replay, reminder_id)
+
+    async def stats(self) -> dict:
+        """Return row counts and database size in bytes"""
+        return await self._run(self._stats)
+
+    async def purge_sent(
+        self, older_than: datetime, batch_size: int = RETENTION_BATCH_SIZE
+    ) -> int:
+        """Delete delivered reminders due before older_than, returning the count
+
+        Rows are deleted in batches, each in its own short transaction, so
+        other queries on the DB thread can run in between.
+        """
+        cutoff = int(older_than.timestamp())
+        deleted = 0
+        while True:
+            count = await self._run(self._purge_sent_batch, cutoff, batch_size)
+            deleted += count
+            if count < batch_size:
+                return deleted
+
+    async def compact(self):
+        """Return free pages to the filesystem and refresh query statistics"""
+        await self._run(self._compact)
+
+
 class Reminders(discord.Cog):
     """Manage reminders that notify you at specific times"""
 
     def __init__(self, bot):
         self.bot = bot
-        self.init_db()
+        # Min-heap of (due timestamp, reminder id) for every pending reminder.
+        # Deleted reminders are dropped from _pending and skipped lazily when
+        # they reach the top of the heap.
+        self._queue: list[tuple[float, int]] = []
+        # Reminder id -> (user_id, channel_id, text, reminder time, recurrence)
+        self._pending: dict[int, tuple[int, int, str, datetime, str | None]] = {}
+        # Failed delivery attempts so far, for reminders being retried
+        self._attempts: dict[int, int] = {}
+        self._wakeup = asyncio.Event()
+        self.store = ReminderStore(DB_PATH, bot.metrics)
+        self.last_retention: dict | None = None
+        # Seconds between each reminder's scheduled time and its delivery
+        self.delivery_latencies: deque[float] = deque(maxlen=1000)
+        self._dispatch_limit = asyncio.Semaphore(DISPATCH_CONCURRENCY)
+        self._when_previews: OrderedDict[tuple[int, str], tuple[float, list]] = (
+            OrderedDict()
+        )
+        # Set once the schedule is loaded from the database or handed over
+        # by the cog this one replaced
+        self._schedule_loaded = False
+        # In a cluster each worker schedules the reminders of the guilds on
+        # its shards, so each is sent exactly once. Replays are handed to the
+        # worker that owns the reminder.
+        bot.cluster.handlers["reminders.replay"] = self.replay
         self.check_reminders.start()
+        # Retention covers the whole shared database, so only one worker runs it
+        if bot.cluster.worker_id == 0:
+            self.purge_sent_reminders.start()
 
     def cog_unload(self):
         self.check_reminders.cancel()
+        self.purge_sent_reminders.cancel()
+        self.bot.cluster.handlers.pop("reminders.replay", None)
+        asyncio.create_task(self.store.close())
 
-    def init_db(self):
-        """Initialize the reminders database"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                channel_id INTEGER NOT NULL,
-                reminder_text TEXT NOT NULL,
-                reminder_time TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                sent INTEGER DEFAULT 0
-            )
-        """
+    async def _stop_scheduler(self):
+        task = self.check_reminders.get_task()
+        self.check_reminders.stop()
+        self._wakeup.set()
+        if task is not None:
+            # Let a dispatch in progress finish rather than cancelling it
+            await asyncio.wait({task})
+
+    async def export_state(self) -> dict:
+        """Stop scheduling and return the in-memory schedule for a reload"""
+        await self._stop_scheduler()
+        return {
+            "queue": self._queue,
+            "pending": self._pending,
+            "attempts": self._attempts,
+            "delivery_latencies": self.delivery_latencies,
+            "last_retention": self.last_retention,
+        }
+
+    async def flush(self):
+        """Finish any dispatch in progress and close the database for a restart"""
+        self.purge_sent_reminders.cancel()
+        await self._stop_scheduler()
+        await self.store.close()
+        log.info(f"Flushed reminders with {len(self._pending)} pending")
+
+    def import_state(self, state: dict):
+        """Adopt the schedule of the cog this one replaced"""
+        self._queue = state["queue"]
+        self._pending = state["pending"]
+        self._attempts = state["attempts"]
+        self.delivery_latencies = state["delivery_latencies"]
+        self.last_retention = state["last_retention"]
+        self._schedule_loaded = True
+        log.info(f"Took over {len(self._pending)} pending reminders")
+
+    async def load_pending(self):
+        """Load every undelivered reminder on our shards into the schedule"""
+        cluster = self.bot.cluster
+        for row in await self.store.pending(cluster.shard_count, cluster.shard_ids):
+            reminder_id, *reminder, attempts, retry_at = row
+            self._pending[reminder_id] = tuple(reminder)
+            if attempts:
+                self._attempts[reminder_id] = attempts
+            due = retry_at or reminder[3]
+            self._queue.append((due.timestamp(), reminder_id))
+        heapq.heapify(self._queue)
+        log.info(f"Loaded {len(self._pending)} pending reminders")
+
+    def schedule(
+        self,
+        reminder_id: int,
+        user_id: int,
+        channel_id: int,
+        text: str,
+        reminder_dt: datetime,
+        recurrence: str | None = None,
+        retry_at: datetime | None = None,
+    ):
+        """Add a reminder to the in-memory schedule"""
+        self._pending[reminder_id] = (
+            user_id,
+            channel_id,
+            text,
+            reminder_dt,
+            recurrence,
         )
-        conn.commit()
-        conn.close()
+        entry = ((retry_at or reminder_dt).timestamp(), reminder_id)
+        heapq.heappush(self._queue, entry)
+        # Only wake the scheduler if this reminder is now the next one due
+        if self._queue[0] == entry:
+            self._wakeup.set()
+
+    def unschedule(self, reminder_id: int):
+        """Remove a reminder from the in-memory schedule"""
+        self._pending.pop(reminder_id, None)
+        self._attempts.pop(reminder_id, None)
+        # Rebuild the heap once it is mostly stale entries
+        if len(self._queue) > 2 * len(self._pending) + 64:
+            self._queue = [e for e in self._queue if e[1] in self._pending]
+            heapq.heapify(self._queue)
+
+    def _next_due(self) -> float | None:
+        """Return the timestamp of the next pending reminder, if any"""
+        while self._queue and self._queue[0][1] not in self._pending:
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+
+    def _pop_due(self, now: float) -> list[tuple]:
+        """Remove and return every reminder due at or before now"""
+        due = []
+        while self._queue and self._queue[0][0] <= now:
+            _, reminder_id = heapq.heappop(self._queue)
+            reminder = self._pending.pop(reminder_id, None)
+            if reminder is not None:
+                due.append((reminder_id, *reminder))
+        return due
+
+    def when_previews(self, user_id: int, value: str) -> list[discord.OptionChoice]:
+        """Suggest resolved times for a partially typed `when` value"""
+        key = (user_id, value)
+        now = time.monotonic()
+        cached = self._when_previews.get(key)
+        if cached and cached[0] > now:
+            self._when_previews.move_to_end(key)
+            return cached[1]
+
+        value = " ".join(value.split())[:80]
+        candidates = [value] if value else []
+        if value[-1:].isdigit():
+            candidates += [value + suffix for suffix in WHEN_UNIT_SUFFIXES]
+        candidates += [ex for ex in WHEN_EXAMPLES if ex.startswith(value.lower())]
+
+        choices = []
+        for candidate in dict.fromkeys(candidates):
+            try:
+                recurrence = parse_recurrence(candidate)
+                dt = recurrence[1] if recurrence else parse_when_to_datetime(candidate)
+            except ValueError:
+                continue
+            resolved = f" → {dt.strftime('%a %Y-%m-%d at %H:%M')}"
+            choices.append(
+                discord.OptionChoice(
+                    # Choice names are limited to 100 characters
+                    name=_shorten(candidate, 100 - len(resolved)) + resolved,
+                    value=candidate,
+                )
+            )
+            if len(choices) == 25:
+                break
+
+        self._when_previews[key] = (now + WHEN_PREVIEW_TTL, choices)
+        if len(self._when_previews) > WHEN_PREVIEW_CACHE_SIZE:
+            self._when_previews.popitem(last=False)
+        return choices
+
+    async def when_autocomplete(self, ctx: discord.AutocompleteContext):
+        return self.when_previews(ctx.interaction.user.id, ctx.value or "")
 
     reminders = SlashCommandGroup("reminders", "Commands for managing reminders")
 
@@ -178,15 +1040,20 @@ class Reminders(discord.Cog):
     )
     @discord.option(
         "when",
-        description="When? Understand formats like '2026-01-05 14:30', 'in 2 weeks', '2h30m', 'monday 14:00'",
+        description="When? e.g. '2026-01-05 14:30', 'in 2 weeks', '2h30m', 'monday 14:00', 'every monday 09:00'",
         required=True,
+        autocomplete=when_autocomplete,
     )
     async def reminders_create(
         self, ctx: discord.ApplicationContext, text: str, when: str
     ):
         """Add a reminder for a specific date and time"""
         try:
-            reminder_dt = parse_when_to_datetime(when)
+            recurrence = parse_recurrence(when)
+            if recurrence:
+                recurrence, reminder_dt = recurrence
+            else:
+                reminder_dt = parse_when_to_datetime(when)
         except ValueError as exc:
             embed = discord.Embed(
                 title="❌ Invalid Time Format",
@@ -205,23 +1072,14 @@ class Reminders(discord.Cog):
             await ctx.respond(embed=embed, ephemeral=True)
             return
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO reminders (user_id, channel_id, reminder_text, reminder_time, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """,
-            (
-                ctx.author.id,
-                ctx.channel.id,
-                text,
-                reminder_dt.isoformat(),
-                datetime.now().isoformat(),
-            ),
+        # Created by the worker receiving the guild's events, which is the
+        # one that loads it on startup
+        reminder_id = await self.store.create(
+            ctx.author.id, ctx.channel.id, text, reminder_dt, recurrence, ctx.guild_id
+        )
+        self.schedule(
+            reminder_id, ctx.author.id, ctx.channel.id, text, reminder_dt, recurrence
         )
-        conn.commit()
-        conn.close()
 
         embed = discord.Embed(
             title="✅ Reminder Set",
@@ -229,19 +1087,14 @@ class Reminders(discord.Cog):
             color=discord.Color.green(),
         )
         embed.add_field(name="Reminder", value=f"_{text}_", inline=False)
+        if recurrence:
+            embed.add_field(name="Repeats", value=f"🔁 {recurrence}", inline=False)
         await ctx.respond(embed=embed, ephemeral=True)
 
     @reminders.command(name="list")
     async def reminders_list(self, ctx: discord.ApplicationContext):
         """View all your active reminders"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, reminder_text, reminder_time FROM reminders WHERE user_id = ? AND sent = 0 ORDER BY reminder_time ASC",
-            (ctx.author.id,),
-        )
-        reminders = cursor.fetchall()
-        conn.close()
+        reminders = await self.store.list_for_user(ctx.author.id)
 
         if not reminders:
             embed = discord.Embed(
@@ -256,13 +1109,11 @@ class Reminders(discord.Cog):
             title="Your Reminders",
             color=discord.Color.blurple(),
         )
-        for reminder_id, text, time_str in reminders:
-            reminder_dt = datetime.fromisoformat(time_str)
-            embed.add_field(
-                name=f"ID: {reminder_id}",
-                value=f"{text}\n🕐 {reminder_dt.strftime('%Y-%m-%d at %H:%M')}",
-                inline=False,
-            )
+        for reminder_id, text, reminder_dt, recurrence in reminders:
+            value = f"{text}\n🕐 {reminder_dt.strftime('%Y-%m-%d at %H:%M')}"
+            if recurrence:
+                value += f" | 🔁 {recurrence}"
+            embed.add_field(name=f"ID: {reminder_id}", value=value, inline=False)
 
         await ctx.respond(embed=embed, ephemeral=True)
 
@@ -272,36 +1123,27 @@ class Reminders(discord.Cog):
     )
     async def reminders_delete(self, ctx: discord.ApplicationContext, reminder_id: int):
         """Delete a reminder"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT user_id FROM reminders WHERE id = ?",
-            (reminder_id,),
-        )
-        result = cursor.fetchone()
+        owner_id = await self.store.owner(reminder_id)
 
-        if not result:
+        if owner_id is None:
             embed = discord.Embed(
                 title="❌ Reminder Not Found",
                 color=discord.Color.red(),
             )
             await ctx.respond(embed=embed, ephemeral=True)
-            conn.close()
             return
 
-        if result[0] != ctx.author.id:
+        if owner_id != ctx.author.id:
             embed = discord.Embed(
                 title="❌ Not Your Reminder",
                 description="You can only delete your own reminders.",
                 color=discord.Color.red(),
             )
             await ctx.respond(embed=embed, ephemeral=True)
-            conn.close()
             return
 
-        cursor.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
-        conn.commit()
-        conn.close()
+        await self.store.delete(reminder_id)
+        self.unschedule(reminder_id)
 
         embed = discord.Embed(
             title="✅ Reminder Deleted",
@@ -309,46 +1151,305 @@ class Reminders(discord.Cog):
         )
         await ctx.respond(embed=embed, ephemeral=True)
 
-    @tasks.loop(seconds=1)
+    @reminders.command(name="stats")
+    @commands.is_owner()
+    async def reminders_stats(self, ctx: discord.ApplicationContext):
+        """Show reminders database size and the last retention run"""
+        stats = await self.store.stats()
+        embed = discord.Embed(
+            title="Reminders Database",
+            color=discord.Color.blurple(),
+        )
+        embed.add_field(name="Rows", value=f"{stats['rows']:,}", inline=True)
+        embed.add_field(
+            name="Size", value=f"{stats['db_bytes'] / 1024:,.1f} KiB", inline=True
+        )
+        embed.add_field(
+            name="States",
+            value="\n".join(
+                f"{state}: {count:,}"
+                for state, count in sorted(stats["states"].items())
+            )
+            or "none",
+            inline=False,
+        )
+
+        if len(self.delivery_latencies) >= 2:
+            latencies = sorted(self.delivery_latencies)
+            p50, p95 = (statistics.quantiles(latencies, n=20)[i] for i in (9, 18))
+            embed.add_field(
+                name="Delivery Latency",
+                value=f"p50 {p50:.2f}s | p95 {p95:.2f}s | max {latencies[-1]:.2f}s",
+                inline=False,
+            )
+
+        if self.last_retention:
+            before = self.last_retention["before"]
+            after = self.last_retention["after"]
+            embed.add_field(
+                name="Last Retention Run",
+                value=(
+                    f"{self.last_retention['time'].strftime('%Y-%m-%d at %H:%M')}\n"
+                    f"Deleted {self.last_retention['deleted']:,} rows\n"
+                    f"{before['rows']:,} → {after['rows']:,} rows\n"
+                    f"{before['db_bytes'] / 1024:,.1f} → {after['db_bytes'] / 1024:,.1f} KiB"
+                ),
+                inline=False,
+            )
+
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    @reminders.command(name="dead")
+    @commands.is_owner()
+    async def reminders_dead(self, ctx: discord.ApplicationContext):
+        """List reminders that could not be delivered"""
+        dead = await self.store.dead()
+
+        if not dead:
+            embed = discord.Embed(
+                title="No Dead Reminders",
+                description="Every reminder has been delivered.",
+                color=discord.Color.green(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title="Dead Reminders",
+            color=discord.Color.red(),
+        )
+        shown = 0
+        # Embeds are limited to 25 fields
+        for reminder_id, user_id, text, reminder_time, attempts, error in dead[:25]:
+            name = f"ID: {reminder_id}"
+            value = (
+                f"<@{user_id}>: {_shorten(text, DEAD_PREVIEW_CHARS)}\n"
+                f"🕐 {datetime.fromtimestamp(reminder_time).strftime('%Y-%m-%d at %H:%M')}"
+                f" | {attempts} attempts\n"
+                f"```{_shorten(error or '', DEAD_PREVIEW_CHARS)}```"
+            )
+            if len(embed) + len(name) + len(value) > DEAD_EMBED_CHARS:
+                break
+            embed.add_field(name=name, value=value, inline=False)
+            shown += 1
+        embed.set_footer(text=f"Showing {shown} of {len(dead)} dead reminders")
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    @reminders.command(name="replay")
+    @commands.is_owner()
+    @discord.option(
+        "reminder_id", description="ID of the dead reminder to resend", required=True
+    )
+    async def reminders_replay(self, ctx: discord.ApplicationContext, reminder_id: int):
+        """Resend a dead reminder"""
+        dead = await self.store.dead_guild(reminder_id)
+        replayed = False
+        if dead is not None:
+            # Replayed by the worker that schedules the reminder's guild
+            owner = self.bot.cluster.worker_of(dead[0])
+            if owner == self.bot.cluster.worker_id:
+                replayed = await self.replay(reminder_id)
+            else:
+                replayed = await self.bot.cluster.call(
+                    owner, "reminders.replay", reminder_id=reminder_id
+                )
+
+        if not replayed:
+            embed = discord.Embed(
+                title="❌ Dead Reminder Not Found",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title="✅ Reminder Replayed",
+            color=discord.Color.green(),
+        )
+        await ctx.respond(embed=embed, ephemeral=True)
+        log.info(f"Reminder {reminder_id} replayed by {ctx.author}")
+
+    async def replay(self, reminder_id: int) -> bool:
+        """Move a dead reminder back to pending and schedule it, if it was dead"""
+        reminder = await self.store.replay(reminder_id)
+        if reminder is None:
+            return False
+        # Retry now rather than at its original (past) time
+        self.schedule(reminder_id, *reminder, None, retry_at=datetime.now())
+        return True
+
+    @tasks.loop()
     async def check_reminders(self):
-        """Check for reminders that need to be sent"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        now = datetime.now()
+        """Sleep until the next reminder is due, then send every due reminder"""
+        self._wakeup.clear()
+        next_due = self._next_due()
+        delay = None if next_due is None else next_due - datetime.now().timestamp()
+        if delay is None or delay > 0:
+            # Woken early by schedule() when a sooner reminder is added
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            return
 
-        cursor.execute(
-            """
-            SELECT id, user_id, channel_id, reminder_text, reminder_time
-            FROM reminders
-            WHERE sent = 0 AND reminder_time <= ?
-            ORDER BY reminder_time ASC
-        """,
-            (now.isoformat(),),
+        due_reminders = self._pop_due(datetime.now().timestamp())
+        claimed = await self.store.claim_due([r[0] for r in due_reminders])
+        await self.schedule_next_occurrences(
+            [r for r in due_reminders if r[0] in claimed and r[5]]
         )
-        due_reminders = cursor.fetchall()
 
-        for reminder_id, user_id, channel_id, text, reminder_time in due_reminders:
+        by_channel = defaultdict(list)
+        for reminder in due_reminders:
+            if reminder[0] in claimed:
+                by_channel[reminder[2]].append(reminder)
+
+        results = await asyncio.gather(
+            *(self.send_channel_reminders(batch) for batch in by_channel.values())
+        )
+        failed = {}
+        for batch_failures in results:
+            failed.update(batch_failures)
+
+        delivered = [rid for rid in claimed if rid not in failed]
+        if delivered:
+            await self.store.mark_delivered(delivered)
+        if failed:
+            await self.handle_failures(failed, due_reminders)
+
+    async def schedule_next_occurrences(self, fired: list[tuple]):
+        """Store and schedule the next occurrence of fired recurring reminders
+
+        Only the next occurrence of a series exists at any time; the one after
+        it is computed when this one fires.
+        """
+        if not fired:
+            return
+        now = datetime.now()
+        occurrences = []
+        for reminder_id, _, _, _, reminder_time, recurrence in fired:
+            next_dt = next_occurrence(recurrence, reminder_time)
+            # Skip occurrences missed while the bot was offline
+            while next_dt <= now:
+                next_dt = next_occurrence(recurrence, next_dt)
+            occurrences.append((reminder_id, next_dt))
+
+        new_ids = await self.store.materialize_next(occurrences)
+        for new_id, reminder, (_, next_dt) in zip(new_ids, fired, occurrences):
+            _, user_id, channel_id, text, _, recurrence = reminder
+            self.schedule(new_id, user_id, channel_id, text, next_dt, recurrence)
+
+    async def send_channel_reminders(
+        self, reminders: list[tuple]
+    ) -> dict[int, Exception]:
+        """Send one channel's due reminders in order, returning any failures"""
+        failures = {}
+        async with self._dispatch_limit:
+            for reminder_id, user_id, channel_id, text, reminder_time, _ in reminders:
+                embed = discord.Embed(
+                    title="🔔 Reminder",
+                    description=text,
+                    color=discord.Color.gold(),
+                )
+                try:
+                    await self.deliver(user_id, channel_id, embed)
+                except Exception as e:
+                    failures[reminder_id] = e
+                    log.warning(f"Failed to send reminder {reminder_id}: {e}")
+                    continue
+                latency = (datetime.now() - reminder_time).total_seconds()
+                self.delivery_latencies.append(latency)
+                self._attempts.pop(reminder_id, None)
+                log.info(
+                    f"Sent reminder {reminder_id} to {user_id} ({latency:.2f}s late)"
+                )
+        return failures
+
+    async def deliver(self, user_id: int, channel_id: int, embed: discord.Embed):
+        """Send a reminder to its channel, falling back to a DM to its owner"""
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
             try:
-                channel = self.bot.get_channel(channel_id)
-                if channel:
-                    embed = discord.Embed(
-                        title="🔔 Reminder",
-                        description=text,
-                        color=discord.Color.gold(),
-                    )
-                    await channel.send(f"<@{user_id}>", embed=embed)
-                    log.info(f"Sent reminder {reminder_id} to {user_id}")
-            except Exception as e:
-                log.error(f"Failed to send reminder {reminder_id}: {e}")
-
-            cursor.execute("UPDATE reminders SET sent = 1 WHERE id = ?", (reminder_id,))
-
-        conn.commit()
-        conn.close()
+                channel = await self.bot.fetch_channel(channel_id)
+            except (discord.NotFound, discord.Forbidden):
+                channel = None
+
+        if channel is not None:
+            try:
+                await channel.send(f"<@{user_id}>", embed=embed)
+                return
+            except (discord.Forbidden, discord.NotFound):
+                # The channel is gone or we lost access to it; try the user
+                # directly
+                pass
+
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        await user.send(embed=embed)
+
+    async def handle_failures(
+        self,
+        failed: dict[int, Exception],
+        due_reminders: list[tuple],
+    ):
+        """Schedule retries with exponential backoff, or dead-letter reminders"""
+        reminders = {reminder[0]: reminder for reminder in due_reminders}
+        updates = []
+        for reminder_id, error in failed.items():
+            attempts = self._attempts.pop(reminder_id, 0) + 1
+            # Missing channels and users and lost permissions won't fix themselves
+            permanent = isinstance(error, (discord.NotFound, discord.Forbidden))
+            if permanent or attempts >= MAX_DELIVERY_ATTEMPTS:
+                updates.append((reminder_id, DEAD, attempts, None, str(error)))
+                log.error(
+                    f"Reminder {reminder_id} dead-lettered after {attempts} attempts: {error}"
+                )
+                continue
+
+            delay = RETRY_BASE_DELAY * 2 ** (attempts - 1)
+            retry_at = datetime.now() + timedelta(
+                seconds=delay + random.uniform(0, delay / 4)
+            )
+            updates.append(
+                (reminder_id, RETRYING, attempts, int(retry_at.timestamp()), str(error))
+            )
+            self._attempts[reminder_id] = attempts
+            # Retries are one-shot; a recurring series has already moved on
+            # to its next occurrence
+            self.schedule(*reminders[reminder_id][:5], retry_at=retry_at)
+        await self.store.mark_failed(updates)
+
+    @tasks.loop(hours=6)
+    async def purge_sent_reminders(self):
+        """Delete old delivered reminders and compact the database"""
+        before = await self.store.stats()
+        deleted = await self.store.purge_sent(
+            datetime.now() - timedelta(days=RETENTION_DAYS)
+        )
+        await self.store.compact()
+        after = await self.store.stats()
+        self.last_retention = {
+            "time": datetime.now(),
+            "deleted": deleted,
+            "before": before,
+            "after": after,
+        }
+        log.info(
+            f"Purged {deleted} delivered reminders: "
+            f"{before['rows']} -> {after['rows']} rows, "
+            f"{before['db_bytes']} -> {after['db_bytes']} bytes"
+        )
+
+    @purge_sent_reminders.before_loop
+    async def before_purge_sent_reminders(self):
+        await self.bot.wait_until_ready()
 
     @check_reminders.before_loop
     async def before_check_reminders(self):
         await self.bot.wait_until_ready()
+        # A replacement process waits for the old one to finish sending
+        await self.bot.handoff_complete.wait()
+        if not self._schedule_loaded:
+            await self.load_pending()
+            self._schedule_loaded = True
 
 
 def setup(bot):
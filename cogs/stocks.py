@@ -1,31 +1,326 @@
 import asyncio
+import importlib
 import logging
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
+import aiohttp
 import discord
-import yfinance as yf
+from discord.ext import tasks
+
+from hot_keys import HotKeys
 
 log = logging.getLogger(__name__)
 
+# Quotes younger than QUOTE_TTL are served without a lookup. Tickers asked for
+# within HOT_WINDOW are refreshed every REFRESH_INTERVAL in the background, up
+# to MAX_TRACKED of the most recently used.
+QUOTE_TTL = 120
+HOT_WINDOW = 900
+REFRESH_INTERVAL = 60
+MAX_TRACKED = 50
+# Most tickers accepted by one batched /stocks lookup
+MAX_BATCH_TICKERS = 10
+# yfinance lookups run on their own small pool so a burst of /stocks can't
+# starve other to_thread users
+LOOKUP_WORKERS = 4
+# Tickers Yahoo doesn't know are remembered so typos don't hit it again
+NOT_FOUND_TTL = 3600
+MAX_NOT_FOUND = 1000
+
 
 class Stocks(discord.Cog):
     """Get stock information"""
 
     def __init__(self, bot: discord.Bot):
         self.bot = bot
+        # ticker -> (fetched at, stock data)
+        self._quotes: dict[str, tuple[float, dict]] = {}
+        self._tracked = HotKeys(HOT_WINDOW, MAX_TRACKED)
+        # ticker -> time until which it is known not to exist
+        self._not_found: dict[str, float] = {}
+        # ticker -> in-flight lookup shared by concurrent requests
+        self._inflight: dict[str, asyncio.Task] = {}
+        # ticker -> (fetched at, price data) from batched downloads, which
+        # only carry prices and so are kept apart from _quotes
+        self._batch_quotes: dict[str, tuple[float, dict]] = {}
+        # ticker -> in-flight batched download that includes it
+        self._batch_inflight: dict[str, asyncio.Task] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=LOOKUP_WORKERS, thread_name_prefix="stocks"
+        )
+        # In a cluster each ticker is cached by one worker, which the others
+        # ask for it
+        bot.cluster.handlers["stocks.quote"] = self._get_cached_quote
+        bot.cluster.handlers["stocks.batch"] = self._get_cached_batch_quotes
+        self.refresh_quotes.start()
+
+    def cog_unload(self):
+        self.refresh_quotes.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.bot.cluster.handlers.pop("stocks.quote", None)
+        self.bot.cluster.handlers.pop("stocks.batch", None)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        with self.bot.metrics.time_upstream("stocks", "yfinance"):
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    def _is_not_found(self, ticker: str, now: float) -> bool:
+        expires = self._not_found.get(ticker)
+        if expires is None:
+            return False
+        if expires <= now:
+            del self._not_found[ticker]
+            return False
+        return True
+
+    def _mark_not_found(self, ticker: str):
+        self._not_found.pop(ticker, None)
+        self._not_found[ticker] = time.monotonic() + NOT_FOUND_TTL
+        # Insertion ordered, so the oldest entries are evicted first
+        while len(self._not_found) > MAX_NOT_FOUND:
+            del self._not_found[next(iter(self._not_found))]
+
+    async def _ask(self, worker: int, name: str, **params):
+        with self.bot.metrics.time_upstream("stocks", "cluster"):
+            return await self.bot.cluster.call(worker, name, **params)
+
+    async def get_quote(self, ticker: str) -> dict | None:
+        """Return stock data for a ticker from the worker that caches it"""
+        owner = self.bot.cluster.owner(ticker)
+        if owner != self.bot.cluster.worker_id:
+            try:
+                return await self._ask(owner, "stocks.quote", ticker=ticker)
+            except aiohttp.ClientError as e:
+                log.warning(f"Worker {owner} unreachable, looking up {ticker}: {e}")
+        return await self._get_cached_quote(ticker)
+
+    async def _get_cached_quote(self, ticker: str) -> dict | None:
+        """Return stock data for a ticker, from the quote store when fresh"""
+        now = time.monotonic()
+        self._tracked.touch(ticker, now)
+
+        cached = self._quotes.get(ticker)
+        if cached and now - cached[0] < QUOTE_TTL:
+            return cached[1]
+        if self._is_not_found(ticker, now):
+            self._tracked.discard(ticker)
+            return None
+
+        return await self._lookup(ticker)
+
+    async def _lookup(self, ticker: str) -> dict | None:
+        """Fetch a ticker, joining a lookup already in flight for it"""
+        task = self._inflight.get(ticker)
+        if task is None:
+            task = asyncio.create_task(self._fetch_quote(ticker))
+            self._inflight[ticker] = task
+            task.add_done_callback(lambda _: self._inflight.pop(ticker, None))
+        # Shielded so one cancelled request doesn't cancel the shared lookup
+        return await asyncio.shield(task)
+
+    async def _fetch_quote(self, ticker: str) -> dict | None:
+        stock_data = await self._run(self._fetch_stock_data, ticker)
+        if stock_data is not None:
+            self._quotes[ticker] = (time.monotonic(), stock_data)
+        else:
+            # Don't keep polling tickers that don't exist
+            self._tracked.discard(ticker)
+            self._mark_not_found(ticker)
+        return stock_data
+
+    @tasks.loop(seconds=REFRESH_INTERVAL)
+    async def refresh_quotes(self):
+        """Keep recently requested tickers fresh so /stocks answers from memory"""
+        hot = self._tracked.hot(time.monotonic())
+        # Run together so every lookup worker is used and a cycle fits well
+        # within REFRESH_INTERVAL
+        results = await asyncio.gather(
+            *(self._lookup(ticker) for ticker in hot), return_exceptions=True
+        )
+        for ticker, result in zip(hot, results):
+            if isinstance(result, Exception):
+                log.error(f"Error refreshing stock data for {ticker}: {result}")
+
+        # Drop quotes for tickers that have gone cold
+        self._quotes = {t: q for t, q in self._quotes.items() if t in self._tracked}
+
+    @refresh_quotes.before_loop
+    async def before_refresh_quotes(self):
+        await self.bot.wait_until_ready()
+        # yfinance pulls in pandas and numpy, so it isn't imported with the
+        # cog. Warm it up once the bot is ready so the first /stocks is fast.
+        start = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, importlib.import_module, "yfinance"
+        )
+        log.info(f"yfinance loaded in {time.perf_counter() - start:.2f}s")
+
+    async def get_batch_quotes(self, tickers: list[str]) -> dict[str, dict | None]:
+        """Return price data for several tickers, batched per worker that caches them"""
+        cluster = self.bot.cluster
+        by_owner = defaultdict(list)
+        for ticker in tickers:
+            by_owner[cluster.owner(ticker)].append(ticker)
+        local = by_owner.pop(cluster.worker_id, [])
+
+        remote = list(by_owner.items())
+        results = await asyncio.gather(
+            *(
+                self._ask(owner, "stocks.batch", tickers=owned)
+                for owner, owned in remote
+            ),
+            return_exceptions=True,
+        )
+        quotes = {}
+        for (owner, owned), result in zip(remote, results):
+            if isinstance(result, aiohttp.ClientError):
+                log.warning(f"Worker {owner} unreachable, looking up {owned}: {result}")
+                local += owned
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                quotes.update(result)
+        if local:
+            quotes.update(await self._get_cached_batch_quotes(local))
+        return quotes
+
+    async def _get_cached_batch_quotes(
+        self, tickers: list[str]
+    ) -> dict[str, dict | None]:
+        """Return price data for several tickers with one batched download
+
+        Tickers already being downloaded for another request join that
+        download rather than starting their own.
+        """
+        now = time.monotonic()
+        quotes = {}
+        for ticker in tickers:
+            for cache in (self._quotes, self._batch_quotes):
+                cached = cache.get(ticker)
+                if cached and now - cached[0] < QUOTE_TTL:
+                    quotes[ticker] = cached[1]
+                    break
+            else:
+                if self._is_not_found(ticker, now):
+                    quotes[ticker] = None
+
+        missing = [t for t in tickers if t not in quotes]
+        new = [t for t in missing if t not in self._batch_inflight]
+        if new:
+            task = asyncio.create_task(self._fetch_batch(new))
+            task.add_done_callback(self._batch_done)
+            for ticker in new:
+                self._batch_inflight[ticker] = task
+        for task in {self._batch_inflight[t] for t in missing}:
+            # Shielded so one cancelled request doesn't cancel the shared download
+            fetched = await asyncio.shield(task)
+            quotes.update({t: fetched[t] for t in missing if t in fetched})
+        return quotes
+
+    async def _fetch_batch(self, tickers: list[str]) -> dict[str, dict | None]:
+        fetched = await self._run(self._fetch_batch_data, tickers)
+        now = time.monotonic()
+        self._batch_quotes = {
+            t: cached
+            for t, cached in self._batch_quotes.items()
+            if now - cached[0] < QUOTE_TTL
+        }
+        for ticker, stock_data in fetched.items():
+            # yfinance reports a failed download as empty rows too, so
+            # tickers missing from a batch aren't negatively cached
+            if stock_data is not None:
+                self._batch_quotes[ticker] = (now, stock_data)
+        return fetched
+
+    def _batch_done(self, task: asyncio.Task):
+        for ticker in [t for t, x in self._batch_inflight.items() if x is task]:
+            del self._batch_inflight[ticker]
+        if not task.cancelled():
+            # Retrieved so a download nobody waits for any more doesn't warn;
+            # the requests that did wait have reported it
+            task.exception()
+
+    async def respond_batch(self, ctx: discord.ApplicationContext, tickers: list[str]):
+        """Respond with a compact multi-row embed for several tickers"""
+        quotes = await self.get_batch_quotes(tickers)
+
+        rows = []
+        failed = []
+        for ticker in tickers:
+            stock_data = quotes.get(ticker)
+            if stock_data is None or stock_data.get("current_price") is None:
+                failed.append(ticker)
+                continue
+            change = stock_data["change"]
+            change_indicator = "🟢" if change >= 0 else "🔴"
+            rows.append(
+                f"**{ticker}** ${stock_data['current_price']:,.2f} "
+                f"{change_indicator} ${change:+,.2f} ({stock_data['change_percent']:+.2f}%)"
+            )
+
+        if not rows:
+            embed = discord.Embed(
+                title="❌ Stocks Not Found",
+                description=f"Could not find data for {', '.join(tickers)}.",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            log.warning(f"Stocks not found: {', '.join(tickers)}")
+            return
+
+        embed = discord.Embed(
+            title="📈 Stocks",
+            description="\n".join(rows),
+            color=discord.Color.blurple(),
+        )
+        if failed:
+            embed.add_field(name="Not Found", value=", ".join(failed), inline=False)
+
+        await ctx.respond(embed=embed)
+        log.info(f"Stock data fetched by {ctx.author} for {', '.join(tickers)}")
 
     @discord.slash_command(name="stocks")
     @discord.option(
         "ticker",
-        description="Stock ticker symbol (e.g., AAPL, MSFT, GOOGL)",
+        description="Stock ticker symbol, or several separated by commas (e.g., AAPL, MSFT, GOOGL)",
         required=True,
     )
     async def stock(self, ctx: discord.ApplicationContext, ticker: str):
         """Get current stock price and information"""
         await ctx.defer()
 
+        tickers = list(
+            dict.fromkeys(t for t in re.split(r"[\s,]+", ticker.upper()) if t)
+        )
+        if not tickers:
+            embed = discord.Embed(
+                title="❌ No Ticker",
+                description="Please give at least one ticker symbol.",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+
+        if len(tickers) > MAX_BATCH_TICKERS:
+            embed = discord.Embed(
+                title="❌ Too Many Tickers",
+                description=f"Please ask for at most {MAX_BATCH_TICKERS} tickers at once.",
+                color=discord.Color.red(),
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+
         try:
-            # Run yfinance in a thread to avoid blocking
-            stock_data = await asyncio.to_thread(self._fetch_stock_data, ticker.upper())
+            if len(tickers) > 1:
+                await self.respond_batch(ctx, tickers)
+                return
+            ticker = tickers[0]
+
+            stock_data = await self.get_quote(ticker.upper())
 
             if stock_data is None:
                 embed = discord.Embed(
@@ -118,36 +413,75 @@ class Stocks(discord.Cog):
             log.error(f"Error fetching stock data for {ticker}: {e}")
 
     def _fetch_stock_data(self, ticker: str) -> dict | None:
-        """Fetch stock data from Yahoo Finance"""
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+        """Fetch stock data from Yahoo Finance
 
-            # Check if we got valid data
-            if not info or info.get("regularMarketPrice") is None:
-                return None
+        Returns None if the ticker doesn't exist. Lookup failures are raised,
+        so they aren't mistaken for unknown tickers and negatively cached.
+        """
+        import yfinance as yf
 
-            current_price = info.get("regularMarketPrice", 0)
-            previous_close = info.get("regularMarketPreviousClose", 0)
-            change = current_price - previous_close
-            change_percent = (
-                (change / previous_close * 100) if previous_close != 0 else 0
-            )
+        stock = yf.Ticker(ticker)
+        info = stock.info
+
+        # Check if we got valid data
+        if not info or info.get("regularMarketPrice") is None:
+            return None
+
+        current_price = info.get("regularMarketPrice", 0)
+        previous_close = info.get("regularMarketPreviousClose", 0)
+        change = current_price - previous_close
+        change_percent = (change / previous_close * 100) if previous_close != 0 else 0
+
+        return {
+            "current_price": current_price,
+            "change": change,
+            "change_percent": change_percent,
+            "high_52w": info.get("fiftyTwoWeekHigh"),
+            "low_52w": info.get("fiftyTwoWeekLow"),
+            "market_cap": info.get("marketCap"),
+            "pe_ratio": info.get("trailingPE"),
+            "company_name": info.get("longName"),
+        }
+
+    def _fetch_batch_data(self, tickers: list[str]) -> dict[str, dict | None]:
+        """Fetch recent prices for several tickers in one Yahoo Finance download
+
+        Download failures are raised, like single-ticker lookups, so they are
+        reported and counted as upstream errors.
+        """
+        import yfinance as yf
 
-            return {
+        data = yf.download(
+            tickers,
+            period="5d",
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=False,
+            progress=False,
+        )
+
+        quotes = {}
+        for ticker in tickers:
+            try:
+                closes = data[ticker]["Close"].dropna()
+            except KeyError:
+                closes = ()
+            # Tickers that don't exist come back as empty columns
+            if len(closes) < 2:
+                quotes[ticker] = None
+                continue
+
+            current_price = float(closes.iloc[-1])
+            previous_close = float(closes.iloc[-2])
+            change = current_price - previous_close
+            quotes[ticker] = {
                 "current_price": current_price,
                 "change": change,
-                "change_percent": change_percent,
-                "high_52w": info.get("fiftyTwoWeekHigh"),
-                "low_52w": info.get("fiftyTwoWeekLow"),
-                "market_cap": info.get("marketCap"),
-                "pe_ratio": info.get("trailingPE"),
-                "company_name": info.get("longName"),
+                "change_percent": (
+                    (change / previous_close * 100) if previous_close != 0 else 0
+                ),
             }
-
-        except Exception as e:
-            log.error(f"Error fetching stock data for {ticker}: {e}")
-            return None
+        return quotes
 
 
 def setup(bot: discord.Bot):
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from typing import Iterator
+
+
+class HotKeys:
+    """Recently requested keys, for a cog to keep fresh in the background
+
+    A key stays hot for window seconds after it was last asked for. At most
+    max_keys are tracked, dropping the least recently used first.
+    """
+
+    def __init__(self, window: float, max_keys: int):
+        self.window = window
+        self.max_keys = max_keys
+        # key -> last time it was asked for, least recent first
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+
+    def touch(self, key: str, now: float):
+        """Record that a key was asked for at now (a time.monotonic() value)"""
+        self._last_used[key] = now
+        self._last_used.move_to_end(key)
+        while len(self._last_used) > self.max_keys:
+            self._last_used.popitem(last=False)
+        # Oldest first, so expired entries are always at the front
+        while now - next(iter(self._last_used.values())) >= self.window:
+            self._last_used.popitem(last=False)
+
+    def discard(self, key: str):
+        """Stop tracking a key, such as one that turned out not to exist"""
+        self._last_used.pop(key, None)
+
+    def hot(self, now: float) -> list[str]:
+        """Return the keys asked for within the window, least recent first"""
+        return [
+            key for key, last in self._last_used.items() if now - last < self.window
+        ]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._last_used
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._last_used)
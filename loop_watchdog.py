@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from types import CodeType, FrameType
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+# How often the loop checks in, and how many stalls are kept for /bot stalls
+BEAT_INTERVAL = 0.1
+MAX_STALLS = 50
+
+
+class Watchdog:
+    """Watches the event loop from a separate thread and reports stalls
+
+    The loop checks in every BEAT_INTERVAL seconds. If it hasn't checked in
+    for threshold seconds, the watchdog thread captures the loop thread's
+    stack and works out which cog and command were running.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        on_lag: Callable[[float], None] | None = None,
+        commands: Callable[[], dict[CodeType, str]] | None = None,
+    ):
+        self.threshold = threshold
+        # Called from the loop with its scheduling lag on every beat
+        self.on_lag = on_lag
+        # Returns the code object -> name of every command callback. Only
+        # called by refresh_commands, since the watchdog thread can't walk
+        # the command tree while the loop changes it.
+        self.commands = commands or dict
+        self._commands: dict[CodeType, str] = {}
+        self.stalls: deque[dict] = deque(maxlen=MAX_STALLS)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._last_beat: float | None = None
+        self._expected = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+
+    def start(self):
+        """Start the watchdog thread; it idles until a loop is attached"""
+        self._thread.start()
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Start watching a running loop; must be called from the loop"""
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._expected = loop.time()
+        self.refresh_commands()
+        self._beat()
+
+    def refresh_commands(self):
+        """Snapshot the command callbacks; call from the thread that changes them"""
+        # Replaced whole, so the watchdog thread always reads a complete map
+        self._commands = self.commands()
+
+    def stop(self):
+        self._stopped.set()
+        if self._handle is not None:
+            self._handle.cancel()
+
+    def _beat(self):
+        now = self._loop.time()
+        self._last_beat = time.monotonic()
+        if self.on_lag:
+            self.on_lag(max(0.0, now - self._expected))
+        self._expected = now + BEAT_INTERVAL
+        self._handle = self._loop.call_later(BEAT_INTERVAL, self._beat)
+
+    def _watch(self):
+        stall = None
+        while not self._stopped.wait(BEAT_INTERVAL):
+            try:
+                stall = self._check(stall)
+            except Exception:
+                # Keep watching; an exception here would otherwise end the
+                # thread and silently stop stall reporting
+                log.exception("Error checking the event loop")
+
+    def _check(self, stall: dict | None) -> dict | None:
+        """Report a stall starting or ending, returning the one in progress"""
+        beat = self._last_beat
+        if beat is None:
+            return None
+        if stall is not None and beat != stall["beat"]:
+            stall["duration"] = beat - stall["beat"]
+            log.warning(
+                f"Event loop was blocked for {stall['duration']:.2f}s "
+                f"in {stall['where']}"
+            )
+            stall = None
+        if stall is None and time.monotonic() - beat >= self.threshold:
+            stall = self._capture(beat)
+            if stall is not None:
+                self.stalls.append(stall)
+                log.warning(
+                    f"Event loop blocked for over {self.threshold}s in "
+                    f"{stall['where']}:\n{''.join(stall['stack'])}"
+                )
+        return stall
+
+    def _capture(self, beat: float) -> dict | None:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        cog, where = self._attribute(frame)
+        return {
+            "time": datetime.now(),
+            "beat": beat,
+            "duration": None,
+            "cog": cog,
+            "where": where,
+            "stack": traceback.format_stack(frame),
+        }
+
+    def _attribute(self, frame: FrameType) -> tuple[str | None, str]:
+        """Return the cog and command (or function) a stack is running"""
+        commands = self._commands
+        cog = function = None
+        # Innermost frame first
+        while frame is not None:
+            if frame.f_code in commands:
+                return cog, f"/{commands[frame.f_code]}"
+            module = frame.f_globals.get("__name__", "")
+            if cog is None and module.startswith("cogs."):
+                cog = module
+                function = frame.f_code.co_name
+            frame = frame.f_back
+        if cog:
+            return cog, f"{cog}.{function}"
+        return None, "unknown code"
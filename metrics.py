@@ -0,0 +1,151 @@
+import bisect
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Histogram:
+    """Counts of observed durations in fixed buckets"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the q-th quantile"""
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {self.count}')
+        labels = f"{{{labels.rstrip(',')}}}" if labels else ""
+        lines.append(f"{name}_sum{labels} {self.sum}")
+        lines.append(f"{name}_count{labels} {self.count}")
+        return lines
+
+
+class Metrics:
+    """Command, upstream and event loop timings for the whole bot
+
+    Served in the Prometheus text format by a small local HTTP server, and
+    summarised by /bot stats.
+    """
+
+    def __init__(self):
+        # command -> durations
+        self.commands: dict[str, Histogram] = defaultdict(Histogram)
+        # (command, error type) -> count
+        self.command_errors: dict[tuple[str, str], int] = defaultdict(int)
+        # (cog, call) -> durations of calls out to APIs and databases
+        self.upstream: dict[tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.upstream_errors: dict[tuple[str, str], int] = defaultdict(int)
+        self.loop_lag = Histogram()
+        self.last_loop_lag = 0.0
+        # interaction id -> when its command was invoked
+        self._started: dict[int, float] = {}
+        # Served on the metrics port; the bot adds its own routes before start
+        self.app = web.Application()
+        self.app.router.add_get("/metrics", self._handle_metrics)
+        self._runner: web.AppRunner | None = None
+
+    def command_started(self, interaction_id: int):
+        self._started[interaction_id] = time.perf_counter()
+
+    def command_finished(
+        self, interaction_id: int, command: str, error: Exception | None = None
+    ):
+        started = self._started.pop(interaction_id, None)
+        if started is not None:
+            self.commands[command].observe(time.perf_counter() - started)
+        if error is not None:
+            self.command_errors[command, type(error).__name__] += 1
+
+    def observe_upstream(self, cog: str, call: str, seconds: float):
+        self.upstream[cog, call].observe(seconds)
+
+    @contextmanager
+    def time_upstream(self, cog: str, call: str):
+        """Time a call out of the bot, counting it as an error if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.upstream_errors[cog, call] += 1
+            raise
+        finally:
+            self.observe_upstream(cog, call, time.perf_counter() - start)
+
+    def observe_loop_lag(self, seconds: float):
+        self.last_loop_lag = seconds
+        self.loop_lag.observe(seconds)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text format"""
+        lines = ["# TYPE brobot_command_duration_seconds histogram"]
+        for command, histogram in sorted(self.commands.items()):
+            lines += histogram.render(
+                "brobot_command_duration_seconds", f'command="{command}",'
+            )
+        lines.append("# TYPE brobot_command_errors_total counter")
+        for (command, error), count in sorted(self.command_errors.items()):
+            lines.append(
+                f'brobot_command_errors_total{{command="{command}",error="{error}"}} {count}'
+            )
+        lines.append("# TYPE brobot_upstream_duration_seconds histogram")
+        for (cog, call), histogram in sorted(self.upstream.items()):
+            lines += histogram.render(
+                "brobot_upstream_duration_seconds", f'cog="{cog}",call="{call}",'
+            )
+        lines.append("# TYPE brobot_upstream_errors_total counter")
+        for (cog, call), count in sorted(self.upstream_errors.items()):
+            lines.append(
+                f'brobot_upstream_errors_total{{cog="{cog}",call="{call}"}} {count}'
+            )
+        lines.append("# TYPE brobot_event_loop_lag_seconds histogram")
+        lines += self.loop_lag.render("brobot_event_loop_lag_seconds", "")
+        return "\n".join(lines) + "\n"
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.render(), content_type="text/plain")
+
+    async def start(self, host: str, port: int):
+        """Start serving /metrics, unless port is 0"""
+        if not port:
+            return
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        log.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+# Where the bot keeps its databases and other runtime state
+DATA_DIR = Path(os.environ.get("BROBOT_DATA_DIR", Path(__file__).parent))
+
+
+class SqliteStore:
+    """A sqlite database on a dedicated thread
+
+    A single long-lived connection is opened on the store's own thread, so
+    disk I/O never blocks the event loop and every statement is reused from
+    the connection's prepared statement cache. Subclasses run their queries
+    on that thread with _run.
+    """
+
+    # Names the database thread, its upstream metrics and its log messages
+    name = "sqlite"
+    # Schema migrations, applied in order. The number already applied is
+    # tracked in the database's user_version pragma, so new migrations must
+    # only ever be appended.
+    migrations: list[Callable[[sqlite3.Connection], None]] = []
+
+    def __init__(self, path: Path, metrics: Metrics | None = None):
+        self.path = path
+        self.metrics = metrics or Metrics()
+        self._conn: sqlite3.Connection | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{self.name}-db"
+        )
+        self._closed = False
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        with self.metrics.time_upstream(self.name, "sqlite"):
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The store's connection, opened on first use from the DB thread"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                self.path, check_same_thread=False, cached_statements=64
+            )
+            self.configure(self._conn)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self.init_db()
+        return self._conn
+
+    def configure(self, conn: sqlite3.Connection):
+        """Set up a newly opened connection, before WAL mode and migrations"""
+
+    def init_db(self):
+        """Initialize the database, applying any pending migrations"""
+        while True:
+            with self._conn:
+                # Workers of a cluster share the database, so the version is
+                # read under the write lock to apply each migration only once
+                self._conn.execute("BEGIN IMMEDIATE")
+                version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+                if version >= len(self.migrations):
+                    return
+                migration = self.migrations[version]
+                migration(self._conn)
+                self._conn.execute(f"PRAGMA user_version = {version + 1}")
+            log.info(
+                f"Applied {self.name} migration {version + 1}: {migration.__name__}"
+            )
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self):
+        """Close the connection and stop the DB thread, after any queued writes"""
+        if self._closed:
+            return
+        self._closed = True
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)